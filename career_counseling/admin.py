@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserProfile, Question, UserResponse, CareerPath, CareerRecommendation, AssessmentReport
+from .models import UserProfile, Question, UserResponse, CareerPath, CareerRecommendation, AssessmentReport, RecommendationJob, AssessmentSubmission, QuestionSet, SlowQuery
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
@@ -35,4 +35,31 @@ class CareerRecommendationAdmin(admin.ModelAdmin):
 class AssessmentReportAdmin(admin.ModelAdmin):
     list_display = ('user', 'created_at')
     list_filter = ('created_at',)
-    search_fields = ('user__username',) 
\ No newline at end of file
+    search_fields = ('user__username',)
+
+@admin.register(RecommendationJob)
+class RecommendationJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'status', 'created_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('user__username',)
+
+@admin.register(AssessmentSubmission)
+class AssessmentSubmissionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'question_set', 'answered_count', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('user__username',)
+
+@admin.register(QuestionSet)
+class QuestionSetAdmin(admin.ModelAdmin):
+    list_display = ('version', 'created_at')
+    readonly_fields = ('version', 'questions', 'created_at')
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'duration_ms', 'database', 'source', 'params_hash')
+    list_filter = ('database', 'source', 'created_at')
+    search_fields = ('sql', 'source')
+    readonly_fields = ('created_at', 'database', 'source', 'duration_ms', 'sql', 'params_hash', 'stack', 'plan')
+
+    def has_add_permission(self, request):
+        return False
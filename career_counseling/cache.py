@@ -0,0 +1,328 @@
+"""
+Tiered Cache
+Per-process LRU in front of a shared Django cache backend, with versioned keys,
+lock-based stampede protection and hit/miss counters
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+from .metrics import count_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# Distinguishes a cached None from a miss
+MISSING = object()
+
+# Lookup counts for the current request while RequestTimingMiddleware is collecting them
+request_cache_counts = ContextVar('request_cache_counts', default=None)
+
+
+class LRUCache:
+    """Small thread-safe in-process LRU mapping with optional per-entry expiry"""
+
+    def __init__(self, maxsize, timeout=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.timeout if self.timeout else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def _shared(alias):
+    return caches[alias] if alias else None
+
+
+def acquire_lock(key, timeout, alias='default'):
+    """
+    Take a cross-process lock in the shared cache
+
+    Returns:
+        Token to release the lock with if this caller holds it, otherwise None
+    """
+    token = uuid.uuid4().hex
+    shared = _shared(alias)
+    if shared is None:
+        return token
+    if isinstance(shared, FileBasedCache):
+        return _acquire_file_lock(shared, _lock_path(shared, key), token, timeout)
+    return token if shared.add(f"lock:{key}", token, timeout) else None
+
+
+def release_lock(key, token, alias='default'):
+    """Release a lock taken with acquire_lock, unless it expired and another caller now holds it"""
+    shared = _shared(alias)
+    if shared is None:
+        return
+    if isinstance(shared, FileBasedCache):
+        path = _lock_path(shared, key)
+        with _file_lock_guard(shared):
+            if _read_file_lock(path)[1] == token:
+                os.remove(path)
+    # The cache API has no compare-and-delete; the window is a lookup long
+    elif shared.get(f"lock:{key}") == token:
+        shared.delete(f"lock:{key}")
+
+
+def is_locked(key, alias='default'):
+    shared = _shared(alias)
+    if shared is None:
+        return False
+    if isinstance(shared, FileBasedCache):
+        return _read_file_lock(_lock_path(shared, key))[0] > time.time()
+    return shared.get(f"lock:{key}") is not None
+
+
+# FileBasedCache.add checks then writes, so two processes can both "add" the same key.
+# Its locks are files holding "<expiry> <token>" instead; every check-and-write of one
+# happens under an OS file lock on a guard file shared by the cache directory
+
+def _lock_path(shared, key):
+    os.makedirs(shared._dir, exist_ok=True)
+    return os.path.join(shared._dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.lock")
+
+
+@contextlib.contextmanager
+def _file_lock_guard(shared):
+    with open(os.path.join(shared._dir, 'locks.guard'), 'a') as guard:
+        locks.lock(guard, locks.LOCK_EX)
+        try:
+            yield
+        finally:
+            locks.unlock(guard)
+
+
+def _read_file_lock(path):
+    """(expiry, token) of a lock file, or (0, None) when there is none"""
+    try:
+        with open(path) as f:
+            expiry, token = f.read().split()
+        return float(expiry), token
+    except (FileNotFoundError, ValueError):
+        return 0, None
+
+
+def _acquire_file_lock(shared, path, token, timeout):
+    with _file_lock_guard(shared):
+        # A live lock is kept; a missing or expired one, left by a holder that died or
+        # overran, is replaced while no other process can check or replace it
+        if _read_file_lock(path)[0] > time.time():
+            return None
+        # Written to a private file and moved into place, so readers never see half a lock
+        fd, pending = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.pending')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{time.time() + timeout} {token}")
+            os.replace(pending, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(pending)
+            raise
+    return token
+
+
+def get_generation(name, alias='default'):
+    """
+    Current generation number for a named piece of data, for use in cache keys
+
+    Always read from the shared tier so every process sees a bump immediately.
+    Generations start from a timestamp, so an evicted counter never repeats an old value.
+    """
+    shared = _shared(alias)
+    if shared is None:
+        return 0
+    key = f"gen:{name}"
+    value = shared.get(key)
+    if value is None:
+        shared.add(key, time.time_ns(), None)
+        value = shared.get(key)
+    return value
+
+
+def bump_generation(name, alias='default'):
+    """Move a generation forward, orphaning every cache entry keyed on the old one"""
+    shared = _shared(alias)
+    if shared is None:
+        return
+    key = f"gen:{name}"
+    try:
+        shared.incr(key)
+    except ValueError:
+        shared.add(key, time.time_ns(), None)
+
+
+class TieredCache:
+    """
+    Namespaced cache with a per-process LRU in front of a shared Django cache
+
+    Keys are prefixed with the namespace and a code version, so bumping the version
+    orphans every entry written by older code without touching the backend.
+    """
+
+    def __init__(self, namespace, version=1, alias='default', timeout=None,
+                 local_size=256, local_timeout=None):
+        """
+        Args:
+            namespace: Prefix for every key of this cache
+            version: Bump when the shape or meaning of cached values changes
+            alias: CACHES alias of the shared tier, or None for a process-local cache
+            timeout: Shared tier expiry in seconds (None uses the backend default)
+            local_size: Entries kept in the per-process LRU (0 disables it)
+            local_timeout: Seconds a local entry is trusted before rechecking the
+                           shared tier; None for content-addressed values that never go stale
+        """
+        self.namespace = namespace
+        self.version = version
+        self.alias = alias
+        self.timeout = timeout
+        self.local = LRUCache(local_size, local_timeout)
+        self._counts = {'local_hits': 0, 'shared_hits': 0, 'misses': 0}
+        self._counts_lock = threading.Lock()
+        _registry[namespace] = self
+
+    def key(self, *parts):
+        """Build a versioned key; long keys are hashed to stay within backend limits"""
+        raw = ':'.join(str(part) for part in parts)
+        if len(raw) > 150:
+            raw = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+        return f"{self.namespace}:v{self.version}:{raw}"
+
+    def _count(self, name):
+        with self._counts_lock:
+            self._counts[name] += 1
+        request_counts = request_cache_counts.get()
+        if request_counts is not None:
+            request_counts[name] += 1
+        count_cache_lookup(self.namespace, name)
+
+    def get(self, key, default=None):
+        value = self.local.get(key, MISSING)
+        if value is not MISSING:
+            self._count('local_hits')
+            return value
+
+        shared = _shared(self.alias)
+        value = shared.get(key, MISSING) if shared is not None else MISSING
+        if value is MISSING:
+            self._count('misses')
+            return default
+
+        self._count('shared_hits')
+        self.local.set(key, value)
+        return value
+
+    def set(self, key, value, timeout=None):
+        self.local.set(key, value)
+        shared = _shared(self.alias)
+        if shared is not None:
+            shared.set(key, value, timeout if timeout is not None else self.timeout)
+
+    def delete(self, key):
+        """Drop a key from the shared tier and this process; other processes follow after local_timeout"""
+        self.local.delete(key)
+        shared = _shared(self.alias)
+        if shared is not None:
+            shared.delete(key)
+
+    def get_or_set(self, key, compute, timeout=None):
+        """
+        Return the cached value, computing and storing it on a miss
+
+        Only one process computes a missing key at a time; the others wait briefly
+        for its result instead of all recomputing it at once.
+        """
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        token = acquire_lock(key, settings.CACHE_LOCK_TIMEOUT, self.alias)
+        if token is not None:
+            try:
+                value = compute()
+                self.set(key, value, timeout)
+            finally:
+                release_lock(key, token, self.alias)
+            return value
+
+        deadline = time.monotonic() + settings.CACHE_LOCK_TIMEOUT
+        while time.monotonic() < deadline and is_locked(key, self.alias):
+            time.sleep(0.05)
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            # The holder failed or timed out; compute without the lock
+            logger.warning(f"Cache lock wait expired for {key}")
+            value = compute()
+            self.set(key, value, timeout)
+        return value
+
+    def clear_local(self):
+        self.local.clear()
+
+    def stats(self):
+        """Hit and miss counts for this process since start"""
+        with self._counts_lock:
+            counts = dict(self._counts)
+        lookups = sum(counts.values())
+        counts['hit_ratio'] = (counts['local_hits'] + counts['shared_hits']) / lookups if lookups else 0.0
+        counts['local_entries'] = len(self.local)
+        return counts
+
+
+# Every TieredCache by namespace, for stats reporting
+_registry = {}
+
+
+def cache_stats():
+    """Hit and miss counts for every tiered cache in this process"""
+    return {namespace: tiered.stats() for namespace, tiered in _registry.items()}
+
+
+def clear_local_caches():
+    """Empty the per-process tier of every tiered cache; the shared tier is untouched"""
+    for tiered in _registry.values():
+        tiered.clear_local()
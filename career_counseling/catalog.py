@@ -0,0 +1,40 @@
+"""
+Catalog Cache
+Questions and career paths change rarely but are read on every assessment and scoring run;
+both are served from the tiered cache and invalidated by signals when edited
+"""
+
+from django.conf import settings
+
+from .cache import TieredCache, bump_generation, get_generation
+from .models import CareerPath, Question
+
+_cache = TieredCache(
+    'catalog',
+    timeout=settings.CATALOG_CACHE_TIMEOUT,
+    local_size=8,
+    local_timeout=settings.CACHE_LOCAL_TIMEOUT,
+)
+
+
+def get_questions():
+    """All questions in display order"""
+    # Copy so callers cannot reorder the list shared through the local tier
+    return list(_cache.get_or_set(_cache.key('questions'), lambda: list(Question.objects.order_by('id'))))
+
+
+def get_career_paths():
+    """All career paths in primary key order"""
+    return list(_cache.get_or_set(_cache.key('career_paths'), lambda: list(CareerPath.objects.order_by('id'))))
+
+
+def catalog_generation():
+    """Changes whenever a question or career path is edited; for keying rendered fragments"""
+    return get_generation('catalog')
+
+
+def invalidate_catalog():
+    """Drop the cached catalog after a question or career path changes"""
+    _cache.delete(_cache.key('questions'))
+    _cache.delete(_cache.key('career_paths'))
+    bump_generation('catalog')
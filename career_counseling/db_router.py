@@ -0,0 +1,108 @@
+"""
+Read Replica Routing
+Sends catalog and history reads to the 'replica' database and pins a user's reads
+to the primary for a short window after they write, so they always see their own changes
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+
+class _PinState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+# Per request (or per background task) routing state; None means unpinned
+_pin_state = ContextVar('db_pin_state', default=None)
+
+
+def _pin_key(user_id):
+    return f"db-pin:{user_id}"
+
+
+def pin_user(user_id):
+    """Serve this user's reads from the primary for the next REPLICA_PIN_SECONDS"""
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return
+    cache.set(_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+@contextmanager
+def use_primary():
+    """Route every read in this block to the primary, e.g. for work that just followed a write"""
+    token = _pin_state.set(_PinState(pinned=True))
+    try:
+        yield
+    finally:
+        _pin_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """Database router for DATABASE_ROUTERS; only active when a 'replica' database is configured"""
+
+    def db_for_read(self, model, **hints):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            return None
+        if model._meta.label_lower not in settings.REPLICA_READ_MODELS:
+            return 'default'
+
+        state = _pin_state.get()
+        if state is not None and state.pinned:
+            return 'default'
+        # Reads inside a transaction must see its uncommitted writes
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _pin_state.get()
+        if state is not None:
+            state.pinned = True
+            state.wrote = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return obj1._state.db in ('default', REPLICA_ALIAS) and obj2._state.db in ('default', REPLICA_ALIAS)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin a request to the primary when its user wrote recently, and start the pin window
+    when the request itself writes. Unsafe methods are pinned from the start.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Without a replica every read goes to the primary; skip the pin lookups
+        if REPLICA_ALIAS not in settings.DATABASES:
+            return self.get_response(request)
+
+        user_id = request.user.pk if request.user.is_authenticated else None
+        pinned = request.method not in ('GET', 'HEAD', 'OPTIONS') or (
+            user_id is not None and cache.get(_pin_key(user_id)) is not None
+        )
+
+        state = _PinState(pinned=pinned)
+        token = _pin_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pin_state.reset(token)
+
+        # Re-read the user: the request may have logged someone in or out
+        if state.wrote and request.user.is_authenticated:
+            pin_user(request.user.pk)
+        return response
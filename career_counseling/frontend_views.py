@@ -6,16 +6,37 @@ Uses ReportLab for PDF generation (pure Python - no external dependencies)
 
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
-from .models import Question, UserResponse, CareerRecommendation, AssessmentReport, UserProfile, CareerPath
+from django.conf import settings
+from django.http import JsonResponse, HttpResponse, FileResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date
+from django.urls import reverse
+from django.db import transaction
+from .models import Question, UserResponse, CareerRecommendation, AssessmentReport, UserProfile, RecommendationJob, AssessmentSubmission
+from .jobs import enqueue_recommendations
+from .streaming import stream_url
+from .reports import get_report_pdf, open_report_pdf, report_content_hash, schedule_report_render
+from .catalog import catalog_generation, get_career_paths, get_questions
+from .cache import cache_stats
+from .instrumentation import route_stats
+from .metrics import observe_scoring, render_metrics
+from .recommendation_cache import (
+    SCORING_VERSION, recommendation_cache_key, get_cached_recommendations, cache_recommendations,
+    recommendation_version, bump_recommendation_version
+)
+from counselbot.log import diagnostics
 from django.contrib.auth.forms import UserCreationForm
 from django.views.decorators.http import require_POST
 import json
 import logging
+import time
 
-# Setup logging
+# Setup logging; per-row diagnostics go to the sampled channel
 logger = logging.getLogger(__name__)
+diagnostics_logger = diagnostics(__name__)
 
 
 def home(request):
@@ -26,33 +47,30 @@ def home(request):
 @login_required
 def profile(request):
     """User profile view showing assessment history and recommendations"""
-    user_responses = UserResponse.objects.filter(user=request.user).order_by('-created_at')
-    career_recommendations = CareerRecommendation.objects.filter(user=request.user).order_by('-confidence_score')
-    
-    # Get or create user profile
+    # Counts and completion come from the profile's summary fields
     profile, created = UserProfile.objects.get_or_create(user=request.user)
     
-    # Calculate profile completion percentage
-    total_fields = 4
-    completed_fields = sum([
-        bool(request.user.first_name),
-        bool(request.user.last_name),
-        bool(profile.education_level),
-        bool(profile.field_of_study)
-    ])
-    profile_completion = (completed_fields / total_fields) * 100
-    
-    # Get all user responses and log them for debugging
-    all_responses = user_responses.all()
-    logger.info(f"Found {all_responses.count()} responses for user {request.user.username}")
-    for response in all_responses:
-        logger.info(f"Response ID: {response.id}, Type: {response.question.question_type}, Date: {response.created_at}")
+    # Latest attempts only; each is one packed row, so no per-answer queries
+    history_limit = settings.PROFILE_HISTORY_LIMIT
+    submissions = list(
+        AssessmentSubmission.objects.filter(user=request.user)
+        .order_by('-created_at', '-id')[:history_limit]
+    )
+    career_recommendations = list(
+        CareerRecommendation.objects.filter(user=request.user)
+        .select_related('career_path')
+        .order_by('-confidence_score')[:5]
+    )
+    logger.info("Loaded %d recent assessments for user %s", len(submissions), request.user.username)
 
     context = {
-        'user_responses': all_responses,  # Show all responses instead of just 5
-        'career_recommendations': career_recommendations[:5],
-        'profile_completion': int(profile_completion),
-        'profile': profile
+        'submissions': submissions,
+        'history_limit': history_limit,
+        'career_recommendations': career_recommendations,
+        'profile_completion': profile.profile_completion,
+        'profile': profile,
+        'submission_count': profile.submission_count,
+        'recommendation_count': profile.recommendation_count,
     }
     return render(request, 'profile.html', context)
 
@@ -74,44 +92,52 @@ def assessment(request):
                         'message': 'No responses provided. Please answer all questions.'
                     }, status=400)
                 
-                # Delete existing responses for this user
-                UserResponse.objects.filter(user=request.user).delete()
+                # Resolve submitted question texts to questions
+                # One indexed lookup by text hash for the whole submission
+                submitted = {question_text.strip(): response_text for question_text, response_text in responses.items()}
+                questions_by_text = {
+                    question.question_text: question
+                    for question in Question.objects.filter(
+                        question_text_hash__in=[Question.hash_text(text) for text in submitted]
+                    )
+                }
                 
-                # Save user responses
-                saved_responses = []
-                for question_text, response_text in responses.items():
-                    try:
-                        question_text_clean = question_text.strip()
-                        question = Question.objects.get(question_text=question_text_clean)
-                        response = UserResponse.objects.create(
-                            user=request.user,
-                            question=question,
-                            response_text=response_text
-                        )
-                        saved_responses.append(response)
-                        logger.info(f"Saved response for: {question_text_clean}")
-                    except Question.DoesNotExist:
-                        logger.warning(f"Question not found: '{question_text_clean}'")
+                answers = []
+                for question_text_clean, response_text in submitted.items():
+                    question = questions_by_text.get(question_text_clean)
+                    if question is None:
+                        logger.warning("Question not found: '%s'", question_text_clean)
                         # Try to find similar question
                         similar = Question.objects.filter(question_text__icontains=question_text_clean[:20]).first()
                         if similar:
-                            logger.info(f"Found similar question: {similar.question_text}")
+                            diagnostics_logger.debug("Found similar question: %s", similar.question_text)
                         continue
+                    answers.append((question, response_text))
+                    diagnostics_logger.debug("Saved response for: %s", question_text_clean)
                 
-                if not saved_responses:
+                if not answers:
                     return JsonResponse({
                         'status': 'error',
                         'message': 'No valid responses could be saved.'
                     }, status=400)
                 
-                # Generate career recommendations
-                generate_recommendations(request.user)
+                # Record the attempt as one row and queue recommendation generation
+                streaming = settings.RECOMMENDATION_STREAMING and bool(data.get('stream'))
+                with transaction.atomic():
+                    changes = record_submission(request.user, answers)
+                    job = enqueue_recommendations(request.user, streaming=streaming, changes=changes)
                 
-                return JsonResponse({
-                    'status': 'success',
-                    'message': 'Assessment completed successfully',
-                    'redirect_url': '/recommendations/'
-                })
+                payload = {
+                    'status': 'queued',
+                    'message': 'Assessment submitted, generating recommendations',
+                    'job_id': str(job.pk),
+                    'status_url': reverse('assessment_status', args=[job.pk]),
+                    'redirect_url': '/recommendations/',
+                    'max_wait_seconds': settings.RECOMMENDATION_CLIENT_MAX_WAIT
+                }
+                if streaming:
+                    payload['stream_url'] = stream_url(job)
+                return JsonResponse(payload, status=202)
                 
             except json.JSONDecodeError:
                 return JsonResponse({
@@ -138,23 +164,18 @@ def assessment(request):
                     messages.error(request, 'Please answer all questions.')
                     return redirect('assessment')
                 
-                # Delete existing responses
-                UserResponse.objects.filter(user=request.user).delete()
-                
-                # Save new responses
-                for question_id, response_text in responses.items():
-                    try:
-                        question = Question.objects.get(id=question_id)
-                        UserResponse.objects.create(
-                            user=request.user,
-                            question=question,
-                            response_text=response_text
-                        )
-                    except Question.DoesNotExist:
-                        continue
+                # Record the attempt, skipping unknown question ids
+                questions = Question.objects.in_bulk([qid for qid in responses if qid.isdigit()])
+                answers = [
+                    (questions[int(question_id)], response_text)
+                    for question_id, response_text in responses.items()
+                    if question_id.isdigit() and int(question_id) in questions
+                ]
+                with transaction.atomic():
+                    changes = record_submission(request.user, answers)
                 
                 # Generate recommendations
-                generate_recommendations(request.user)
+                generate_recommendations(request.user, changes=changes)
                 return redirect('recommendations')
                 
             except Exception as e:
@@ -163,66 +184,297 @@ def assessment(request):
                 return redirect('assessment')
                 
     # GET request - show assessment form
-    questions = Question.objects.all().order_by('id')
+    questions = get_questions()
     
     return render(request, 'career_counseling/assessment.html', {
         'questions': questions
     })
-def generate_recommendations(user):
-    """Generate career recommendations based on user responses"""
+
+
+@login_required
+def assessment_status(request, job_id):
+    """
+    Report the state of a queued recommendation job
+    Supports long-polling via ?wait=<seconds> (capped by RECOMMENDATION_STATUS_MAX_WAIT)
+    """
+    try:
+        job = RecommendationJob.objects.get(pk=job_id, user=request.user)
+    except RecommendationJob.DoesNotExist:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Assessment job not found'
+        }, status=404)
+    
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        wait = 0
+    deadline = time.monotonic() + min(max(wait, 0), settings.RECOMMENDATION_STATUS_MAX_WAIT)
+    
+    while job.status in ('PENDING', 'RUNNING') and time.monotonic() < deadline:
+        time.sleep(0.5)
+        job.refresh_from_db(fields=['status', 'error'])
+    
+    if job.status == 'DONE':
+        return JsonResponse({
+            'status': 'success',
+            'job_status': job.status,
+            'message': 'Assessment completed successfully',
+            'redirect_url': '/recommendations/'
+        })
+    if job.status == 'FAILED':
+        return JsonResponse({
+            'status': 'error',
+            'job_status': job.status,
+            'message': 'Error processing assessment'
+        }, status=500)
+    return JsonResponse({
+        'status': 'pending',
+        'job_status': job.status,
+        'message': 'Generating recommendations'
+    })
+
+
+def generate_recommendations(user, on_result=None, changes=None):
+    """
+    Generate career recommendations based on user responses
+    
+    Args:
+        user: Django User object
+        on_result: Optional callable invoked with (career_path, score, reasoning)
+                   as soon as each career path has been scored
+        changes: Optional answer changes from record_submission; when the stored
+                 scores were computed from the attempt they were diffed against,
+                 those scores are shifted by each change's contribution delta
+                 instead of being rescored from zero
+    
+    Returns:
+        True if recommendations were written, False otherwise
+    """
     try:
-        # Get user responses
-        user_responses = UserResponse.objects.filter(user=user)
+        # The latest attempt's answers, with their questions, in a single query
+        submission = AssessmentSubmission.objects.latest_for(user)
+        user_responses = answers_of(user, submission)
         
-        if not user_responses.exists():
-            logger.warning(f"No responses found for user {user.username}")
-            return
+        if not user_responses:
+            logger.warning("No responses found for user %s", user.username)
+            return False
         
-        logger.info(f"Generating recommendations for user: {user.username}")
-        logger.info(f"User has {user_responses.count()} responses")
+        logger.info("Generating recommendations for user: %s (%d responses)", user.username, len(user_responses))
         
         # Get all career paths
-        career_paths = CareerPath.objects.all()
-        logger.info(f"Scoring against {career_paths.count()} career paths")
-        
-        # Clear existing recommendations
-        CareerRecommendation.objects.filter(user=user).delete()
-        
-        # Score each career path
-        all_scores = []
-        for career_path in career_paths:
-            score = calculate_career_score(user_responses, career_path)
-            all_scores.append((career_path, score))
-            logger.info(f"Score for {career_path.title}: {score}")
-        
-        # Create recommendations for all career paths (not just those with score > 0)
-        for career_path, score in all_scores:
-            # Generate reasoning even for lower scores
-            reasoning = generate_recommendation_reasoning(user_responses, career_path, score)
+        career_paths = get_career_paths()
+        logger.info("Scoring against %d career paths", len(career_paths))
+        
+        # Reuse the results of an identical answer set when one has been scored before
+        started = time.perf_counter()
+        cache_key = recommendation_cache_key(user_responses, career_paths)
+        results = get_cached_recommendations(cache_key, career_paths)
+        
+        if results is not None:
+            observe_scoring('cached', time.perf_counter() - started)
+            logger.info("Using cached recommendations for user: %s", user.username)
+            for career_path, score, reasoning in results:
+                if on_result is not None:
+                    on_result(career_path, score, reasoning)
+            save_recommendations(user, results, submission)
+        else:
+            # Shift stored scores by the changed answers when possible
+            if changes is not None:
+                results = update_recommendations_incrementally(user, submission, user_responses, career_paths, changes)
             
-            CareerRecommendation.objects.create(
-                user=user,
-                career_path=career_path,
-                confidence_score=score,
-                reasoning=reasoning
-            )
-            logger.info(f"Created recommendation: {career_path.title} with score {score}")
+            if results is not None:
+                observe_scoring('incremental', time.perf_counter() - started)
+                logger.info(
+                    "Applied %d answer changes incrementally for user: %s", len(changes['answers']), user.username
+                )
+                for career_path, score, reasoning in results:
+                    if on_result is not None:
+                        on_result(career_path, score, reasoning)
+            else:
+                # Score each career path, reporting results as they are produced
+                results = []
+                for career_path, score, reasoning in iter_recommendation_scores(user_responses, career_paths):
+                    results.append((career_path, score, reasoning))
+                    if on_result is not None:
+                        on_result(career_path, score, reasoning)
+                observe_scoring('full', time.perf_counter() - started)
+                
+                # Persist all recommendations in one batch
+                save_recommendations(user, results, submission)
+            
+            cache_recommendations(cache_key, results)
         
         # Generate or update assessment report
         generate_assessment_report(user)
-        logger.info(f"Recommendations generated for user: {user.username}")
+        
+        # Retire the user's cached recommendation pages once the new rows are committed
+        transaction.on_commit(lambda: bump_recommendation_version(user.id))
+        logger.info("Recommendations generated for user: %s", user.username)
+        return True
         
     except Exception as e:
         logger.error(f"Error generating recommendations: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
+        return False
+
+
+def iter_recommendation_scores(user_responses, career_paths):
+    """Yield (career_path, score, reasoning) for each career path as it is scored"""
+    for career_path in career_paths:
+        score = calculate_career_score(user_responses, career_path)
+        diagnostics_logger.debug("Score for %s: %.2f", career_path.title, score)
+        
+        # Generate reasoning even for lower scores
+        reasoning = generate_recommendation_reasoning(user_responses, career_path, score)
+        yield career_path, score, reasoning
+
+
+def save_recommendations(user, results, submission=None):
+    """Replace the user's recommendations with the results scored from submission in a single write"""
+    with transaction.atomic():
+        CareerRecommendation.objects.filter(user=user).delete()
+        CareerRecommendation.objects.bulk_create([
+            CareerRecommendation(
+                user=user,
+                career_path=career_path,
+                confidence_score=score,
+                reasoning=reasoning,
+                scoring_version=SCORING_VERSION,
+                submission=submission
+            )
+            for career_path, score, reasoning in results
+        ])
+        UserProfile.objects.filter(user=user).update(recommendation_count=len(results))
+    logger.info("Saved %d recommendations for user: %s", len(results), user.username)
+
+
+def update_recommendations_incrementally(user, submission, user_responses, career_paths, changes):
+    """
+    Apply the score delta of each changed answer to the user's stored recommendations
+    
+    Args:
+        submission: The attempt being scored, which must be the one changes lead to
+        changes: Output of record_submission
+    
+    Returns:
+        List of (career_path, score, reasoning) tuples, or None when the stored
+        scores cannot be reused and a full rescore is required
+    """
+    # Jobs queued before attempts were tracked carry a bare list of changes
+    if not isinstance(changes, dict) or submission is None or submission.id != changes['submission']:
+        return None
+    
+    stored = list(CareerRecommendation.objects.filter(user=user))
+    existing = {rec.career_path_id: rec for rec in stored}
+    # Deltas only hold for one current rule-based score per career path, computed from
+    # the attempt the changes were diffed against. Model predictions, older scorer
+    # versions, duplicate rows and scores from any other attempt, e.g. when a job
+    # failed or a delta was already applied, need a full rescore
+    if (
+        len(stored) != len(career_paths)
+        or set(existing) != {career_path.id for career_path in career_paths}
+        or any(rec.scoring_version != SCORING_VERSION for rec in stored)
+        or any(rec.submission_id != changes['previous'] for rec in stored)
+    ):
+        return None
+    
+    delta = sum(
+        response_score_contribution(question_type, new_text) - response_score_contribution(question_type, old_text)
+        for question_type, old_text, new_text in changes['answers']
+    )
+    
+    results = []
+    for career_path in career_paths:
+        rec = existing[career_path.id]
+        # A clamped score has lost its raw value, so the delta cannot be applied
+        if not 0.0 < rec.confidence_score < 1.0:
+            return None
+        
+        score = min(1.0, max(0.0, rec.confidence_score + delta))
+        rec.confidence_score = score
+        rec.submission = submission
+        rec.reasoning = generate_recommendation_reasoning(user_responses, career_path, score)
+        results.append((career_path, score, rec.reasoning))
+    
+    CareerRecommendation.objects.bulk_update(list(existing.values()), ['confidence_score', 'reasoning', 'submission'])
+    return results
+
+
+def record_submission(user, answers):
+    """
+    Record an assessment attempt and diff it against the user's previous attempt
+    
+    Args:
+        user: Django User object
+        answers: List of (Question, response_text) tuples
+    
+    Returns:
+        Dict with the ids of the 'previous' and new 'submission' and the 'answers' that
+        changed, as [question_type, old_text, new_text] lists where old_text is None for
+        new answers and new_text is None for answers that were dropped; None when there
+        is no decodable previous attempt to diff against
+    """
+    previous = AssessmentSubmission.objects.latest_for(user)
+    submission = AssessmentSubmission.objects.record(user, answers)
+    if previous is None or previous.question_set is None:
+        return None
+    
+    old = {item.question.id: item for item in previous.responses}
+    new = {item.question.id: item for item in submission.responses}
+    changes = []
+    for question_id in sorted(old.keys() | new.keys()):
+        old_item, new_item = old.get(question_id), new.get(question_id)
+        old_text = old_item.response_text if old_item else None
+        new_text = new_item.response_text if new_item else None
+        if old_text != new_text:
+            question_type = (new_item or old_item).question.question_type
+            changes.append([question_type, old_text, new_text])
+    
+    logger.info("Recorded submission with %d changed answers for user: %s", len(changes), user.username)
+    return {'previous': previous.id, 'submission': submission.id, 'answers': changes}
+
+
+def current_answers(user):
+    """
+    The answers recommendations are scored from
+    
+    Returns:
+        The answered SubmittedAnswer items of the user's latest attempt, or the
+        UserResponse rows written through the API for users who have no attempts
+    """
+    return answers_of(user, AssessmentSubmission.objects.latest_for(user))
+
+
+def answers_of(user, submission):
+    """current_answers for an already loaded latest attempt, which may be None"""
+    if submission is not None:
+        return submission.responses
+    return list(UserResponse.objects.filter(user=user).select_related('question'))
+
+
+def response_score_contribution(question_type, response_text):
+    """Score contribution of a single answer; calculate_career_score adds these to a 0.5 base"""
+    if response_text is None:
+        return 0
+    
+    # Boost score for specific question type answers
+    if question_type == 'SKILLS':
+        if response_text.lower() in ['excellent', 'very good', 'good', 'proficient']:
+            return 0.05
+    elif question_type == 'INTERESTS':
+        return 0.02
+    elif question_type == 'PERSONALITY':
+        return 0.01
+    return 0
 
 
 def calculate_career_score(user_responses, career_path):
     """Calculate match score between user responses and career path"""
     try:
         total_score = 0
-        response_count = user_responses.count()
+        response_count = len(user_responses)
         
         if response_count == 0:
             return 0
@@ -234,22 +486,11 @@ def calculate_career_score(user_responses, career_path):
         
         # Check question types to adjust score
         for response in user_responses:
-            question = response.question
-            response_lower = response.response_text.lower()
-            
-            # Boost score for specific question type answers
-            if question.question_type == 'SKILLS':
-                if response_lower in ['excellent', 'very good', 'good', 'proficient']:
-                    base_score += 0.05
-            elif question.question_type == 'INTERESTS':
-                base_score += 0.02
-            elif question.question_type == 'PERSONALITY':
-                base_score += 0.01
+            base_score += response_score_contribution(response.question.question_type, response.response_text)
         
         # Normalize to 0-1 range
         score = min(1.0, max(0.0, base_score))
         
-        logger.info(f"Score for {career_path.title}: {score:.2f}")
         return score
         
     except Exception as e:
@@ -323,7 +564,7 @@ def generate_recommendation_reasoning(user_responses, career_path, score):
 def generate_assessment_report(user):
     """Create or update assessment report with analysis"""
     try:
-        user_responses = UserResponse.objects.filter(user=user)
+        user_responses = current_answers(user)
         
         # Prepare analysis data
         skill_analysis = {}
@@ -351,6 +592,9 @@ def generate_assessment_report(user):
             personality_insights=personality_insights
         )
         
+        # Pre-render the PDF in the background so it is ready before the first download
+        transaction.on_commit(lambda: schedule_report_render(report))
+        
         logger.info(f"Assessment report generated for user: {user.username}")
         
     except Exception as e:
@@ -361,17 +605,20 @@ def generate_assessment_report(user):
 def recommendations(request):
     """Display career recommendations for the user"""
     try:
-        recommendations = CareerRecommendation.objects.filter(user=request.user).order_by('-confidence_score')
-        
-        logger.info(f"Loading recommendations for user: {request.user.username}")
-        logger.info(f"Found {recommendations.count()} recommendations")
+        # Lazy: only evaluated, in one query, when the cached fragment is missing
+        recommendations = (
+            CareerRecommendation.objects.filter(user=request.user)
+            .select_related('career_path')
+            .order_by('-confidence_score')
+        )
         
-        for rec in recommendations:
-            logger.info(f"  - {rec.career_path.title}: {rec.confidence_score}")
+        logger.info("Loading recommendations for user: %s", request.user.username)
         
         context = {
             'recommendations': recommendations,
-            'recommendation_count': recommendations.count()
+            'recommendation_version': recommendation_version(request.user.id),
+            'catalog_version': catalog_generation(),
+            'cache_timeout': settings.PAGE_FRAGMENT_CACHE_TIMEOUT,
         }
         return render(request, 'recommendations.html', context)
         
@@ -385,21 +632,27 @@ def recommendations(request):
 def career_detail(request, career_id):
     """Display detailed information about a specific career"""
     try:
-        career = CareerPath.objects.get(id=career_id)
-        recommendation = CareerRecommendation.objects.filter(
-            user=request.user,
-            career_path=career
-        ).first()
+        career = next((path for path in get_career_paths() if path.id == career_id), None)
+        if career is None:
+            messages.error(request, 'Career not found')
+            return redirect('recommendations')
+        
+        # Only loaded when the cached fragment is missing
+        recommendation = SimpleLazyObject(
+            lambda: CareerRecommendation.objects.filter(user=request.user, career_path_id=career_id)
+            .select_related('career_path')
+            .first()
+        )
         
         context = {
             'career': career,
-            'recommendation': recommendation
+            'recommendation': recommendation,
+            'recommendation_version': recommendation_version(request.user.id),
+            'catalog_version': catalog_generation(),
+            'cache_timeout': settings.PAGE_FRAGMENT_CACHE_TIMEOUT,
         }
         return render(request, 'career_detail.html', context)
         
-    except CareerPath.DoesNotExist:
-        messages.error(request, 'Career not found')
-        return redirect('recommendations')
     except Exception as e:
         logger.error(f"Error loading career detail: {str(e)}")
         messages.error(request, 'Error loading career details')
@@ -414,25 +667,27 @@ def assessment_detail(request, assessment_id):
         # Log user information
         logger.info(f"User: {request.user.username} (authenticated: {request.user.is_authenticated})")
         
-        # Get the user response
-        response = UserResponse.objects.get(id=assessment_id, user=request.user)
-        logger.info(f"Found UserResponse: id={response.id}, question_type={response.question.question_type}")
+        # Get the attempt and decode its answers against the questions it was recorded with
+        submission = AssessmentSubmission.objects.select_related('question_set').get(id=assessment_id, user=request.user)
+        answers = submission.responses
+        logger.info("Found AssessmentSubmission: id=%s, %d answers", submission.id, len(answers))
         
         # Get recommendations
         recommendations = CareerRecommendation.objects.filter(user=request.user).order_by('-confidence_score')
         logger.info(f"Found {recommendations.count()} recommendations")
         
         context = {
-            'response': response,
+            'submission': submission,
+            'answers': answers,
             'recommendations': recommendations
         }
         logger.info("Rendering template with context")
         return render(request, 'assessment_detail.html', context)
         
-    except UserResponse.DoesNotExist as e:
-        logger.error(f"UserResponse not found: ID={assessment_id}, User={request.user.username}")
+    except AssessmentSubmission.DoesNotExist as e:
+        logger.error(f"AssessmentSubmission not found: ID={assessment_id}, User={request.user.username}")
         logger.error(f"Full error: {str(e)}")
-        messages.error(request, 'Assessment response not found. Please try again.')
+        messages.error(request, 'Assessment not found. Please try again.')
         return redirect('profile')
     except Exception as e:
         logger.error(f"Unexpected error in assessment_detail: {str(e)}")
@@ -443,6 +698,43 @@ def assessment_detail(request, assessment_id):
         return redirect('profile')
 
 
+@login_required
+def view_report(request):
+    """
+    Display the assessment report as HTML
+    The body is fragment-cached per report version, so repeat views skip both PDF layout and template rendering
+    """
+    report = AssessmentReport.objects.filter(user=request.user).order_by('-created_at').first()
+    if not report:
+        messages.warning(request, 'No assessment report found. Please complete an assessment first.')
+        return redirect('assessment')
+    
+    recommendations = list(
+        CareerRecommendation.objects.filter(user=request.user)
+        .select_related('career_path')
+        .order_by('-confidence_score')
+    )
+    
+    # Same content hash as the stored PDF; it only changes when the report contents do
+    report_version = report_content_hash(request.user, report, recommendations)
+    etag = f'"{report_version}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+    
+    response = render(request, 'pdf/assessment_report.html', {
+        'user': request.user,
+        'report': report,
+        'recommendations': recommendations,
+        'report_version': report_version,
+        'cache_timeout': settings.REPORT_HTML_CACHE_TIMEOUT,
+    })
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 @login_required
 def download_report(request):
     """
@@ -457,19 +749,37 @@ def download_report(request):
             return redirect('assessment')
         
         # Get career recommendations
-        recommendations = CareerRecommendation.objects.filter(user=request.user).order_by('-confidence_score')
+        recommendations = list(
+            CareerRecommendation.objects.filter(user=request.user)
+            .select_related('career_path')
+            .order_by('-confidence_score')
+        )
         
-        if not recommendations.exists():
+        if not recommendations:
             messages.warning(request, 'No career recommendations found. Please complete an assessment first.')
             return redirect('assessment')
         
-        # Generate PDF using ReportLab
-        from .pdf_generator import generate_pdf_report
-        pdf_buffer = generate_pdf_report(request.user, report, recommendations)
-        
-        # Create HTTP response with PDF
-        response = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="career_assessment_report.pdf"'
+        # Render the PDF once per report version and reuse the stored file
+        content_hash = get_report_pdf(request.user, report, recommendations)
+        etag = f'"{content_hash}"'
+        last_modified = int(report.report_file.storage.get_modified_time(report.report_file.name).timestamp())
+        
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            not_modified['Last-Modified'] = http_date(last_modified)
+            return not_modified
+        
+        # Stream the stored cover joined with its shared body
+        response = FileResponse(
+            open_report_pdf(report),
+            content_type='application/pdf',
+            as_attachment=True,
+            filename='career_assessment_report.pdf'
+        )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
         
         logger.info(f"PDF report downloaded by user: {request.user.username}")
         return response
@@ -500,3 +810,22 @@ def register(request):
         form = UserCreationForm()
     
     return render(request, 'registration/register.html', {'form': form})
+
+
+def prometheus_metrics(request):
+    """Prometheus text format metrics; limited to METRICS_ALLOWED_IPS when that is set"""
+    allowed = settings.METRICS_ALLOWED_IPS
+    if allowed and request.META.get('REMOTE_ADDR') not in allowed:
+        return HttpResponse(status=403)
+    
+    rendered = render_metrics()
+    if rendered is None:
+        return HttpResponse('prometheus_client is not installed', status=503, content_type='text/plain')
+    body, content_type = rendered
+    return HttpResponse(body, content_type=content_type)
+
+
+@staff_member_required
+def request_timings(request):
+    """Rolling per-route latency and query percentiles, and cache hit ratios, for this process"""
+    return JsonResponse({'routes': route_stats(), 'caches': cache_stats()})
@@ -0,0 +1,170 @@
+"""
+Request Instrumentation
+Per-request wall time, database query count and time, and cache lookups, with
+rolling per-route percentiles and budget warnings
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import request_cache_counts
+from .metrics import CACHE_RESULTS, observe_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestTiming:
+    """Measurements for one request; doubles as the execute_wrapper that counts its queries"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.route = None
+        self.duration = 0.0
+        self.queries = 0
+        self.query_time = 0.0
+        self.cache = dict.fromkeys(CACHE_RESULTS, 0)
+        self.over_budget = False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - start
+            self.queries += 1
+
+    @property
+    def cache_hits(self):
+        return self.cache['local_hits'] + self.cache['shared_hits']
+
+    def server_timing(self):
+        """Value for the Server-Timing response header"""
+        lookups = self.cache_hits + self.cache['misses']
+        return (
+            f'app;dur={self.duration * 1000:.1f}, '
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries", '
+            f'cache;desc="{self.cache_hits}/{lookups} hits"'
+        )
+
+
+class RouteStats:
+    """Rolling window of the most recent requests to one route, plus running totals"""
+
+    def __init__(self, window):
+        self.durations = deque(maxlen=window)
+        self.queries = deque(maxlen=window)
+        self.count = 0
+        self.over_budget = 0
+        self.cache = dict.fromkeys(CACHE_RESULTS, 0)
+
+    def add(self, timing):
+        self.durations.append(timing.duration)
+        self.queries.append(timing.queries)
+        self.count += 1
+        self.over_budget += timing.over_budget
+        for result, count in timing.cache.items():
+            self.cache[result] += count
+
+    def summary(self):
+        durations = sorted(self.durations)
+        queries = sorted(self.queries)
+        lookups = sum(self.cache.values())
+        return {
+            'count': self.count,
+            'over_budget': self.over_budget,
+            'p50_ms': round(percentile(durations, 50) * 1000, 2),
+            'p90_ms': round(percentile(durations, 90) * 1000, 2),
+            'p99_ms': round(percentile(durations, 99) * 1000, 2),
+            'max_ms': round(durations[-1] * 1000, 2) if durations else 0.0,
+            'queries_p50': percentile(queries, 50),
+            'queries_max': queries[-1] if queries else 0,
+            'cache': dict(self.cache),
+            'cache_hit_ratio': round(1 - self.cache['misses'] / lookups, 3) if lookups else None,
+        }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+# RouteStats by route name for this process
+_routes = {}
+_routes_lock = threading.Lock()
+
+
+def route_stats():
+    """Rolling latency and query percentiles and cache lookup totals for every route this process has served"""
+    with _routes_lock:
+        return {route: stats.summary() for route, stats in sorted(_routes.items())}
+
+
+def _record(timing):
+    with _routes_lock:
+        stats = _routes.get(timing.route)
+        if stats is None:
+            stats = _routes[timing.route] = RouteStats(settings.REQUEST_TIMING_WINDOW)
+        stats.add(timing)
+
+
+def request_budget(route):
+    """(milliseconds, queries) allowed for a route"""
+    override = settings.REQUEST_BUDGET_OVERRIDES.get(route, {})
+    return (override.get('ms', settings.REQUEST_TIME_BUDGET_MS),
+            override.get('queries', settings.REQUEST_QUERY_BUDGET))
+
+
+class RequestTimingMiddleware:
+    """
+    Time each request, count its queries on every database and its tiered cache lookups
+
+    The measurements are attached to the request as `request.timing`. Requests over
+    their route's budget are logged; with SERVER_TIMING_HEADER the response also
+    carries a Server-Timing header for the browser's network panel.
+    Streaming responses are timed up to the point the response object is returned.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        request.timing = timing
+        token = request_cache_counts.set(timing.cache)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timing))
+                response = self.get_response(request)
+        finally:
+            request_cache_counts.reset(token)
+
+        timing.duration = time.perf_counter() - timing.started
+        match = request.resolver_match
+        timing.route = match.view_name if match is not None else 'unresolved'
+
+        budget_ms, budget_queries = request_budget(timing.route)
+        if timing.duration * 1000 > budget_ms or timing.queries > budget_queries:
+            timing.over_budget = True
+            logger.warning(
+                "Request over budget: %s %s took %.0fms with %d queries (%.0fms in SQL), budget %sms/%s queries",
+                request.method, timing.route, timing.duration * 1000, timing.queries,
+                timing.query_time * 1000, budget_ms, budget_queries,
+            )
+        _record(timing)
+        observe_request(
+            timing.route, request.method, response.status_code, timing.duration, timing.queries, timing.cache,
+        )
+
+        if settings.SERVER_TIMING_HEADER:
+            response['Server-Timing'] = timing.server_timing()
+        return response
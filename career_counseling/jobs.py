@@ -0,0 +1,176 @@
+"""
+Recommendation Job Queue
+DB-backed queue that runs recommendation and report generation off the request thread
+"""
+
+import logging
+import queue
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .db_router import pin_user, use_primary
+from .models import RecommendationJob
+from .slow_queries import capture_slow_queries
+
+logger = logging.getLogger(__name__)
+
+# In-process worker state; the database row stays the source of truth
+_job_queue = queue.Queue()
+_workers = []
+_workers_lock = threading.Lock()
+
+
+def enqueue_recommendations(user, streaming=False, changes=None):
+    """
+    Create a pending recommendation job for the user and hand it to a worker
+
+    Args:
+        user: Django User object
+        streaming: Reserve the job for a Server-Sent Events client; workers only
+                   pick it up if no client claims it within the grace period
+        changes: Answer changes from record_submission, for incremental rescoring
+
+    Returns:
+        RecommendationJob instance in PENDING state
+    """
+    job = RecommendationJob.objects.create(user=user, streaming=streaming, changes=changes)
+    transaction.on_commit(lambda: _dispatch(job.pk, streaming))
+    logger.info(f"Queued recommendation job {job.pk} for user: {user.username}")
+    return job
+
+
+def _dispatch(job_id, streaming=False):
+    """Push a job id to the in-process workers, if any are configured"""
+    # Streaming jobs are left for the idle sweep so the SSE client can claim them first
+    if _start_workers() and not streaming:
+        _job_queue.put(job_id)
+
+
+def _start_workers():
+    """Lazily start the worker threads. Returns False when in-process workers are disabled."""
+    thread_count = getattr(settings, 'RECOMMENDATION_WORKER_THREADS', 0)
+    if thread_count <= 0:
+        return False
+
+    with _workers_lock:
+        _workers[:] = [worker for worker in _workers if worker.is_alive()]
+        while len(_workers) < thread_count:
+            worker = threading.Thread(
+                target=_worker_loop,
+                name=f"recommendation-worker-{len(_workers) + 1}",
+                daemon=True
+            )
+            worker.start()
+            _workers.append(worker)
+    return True
+
+
+def _worker_loop():
+    """Process queued job ids; fall back to sweeping the table when idle"""
+    poll_interval = getattr(settings, 'RECOMMENDATION_WORKER_POLL_SECONDS', 5)
+    while True:
+        try:
+            job_id = _job_queue.get(timeout=poll_interval)
+        except queue.Empty:
+            job_id = None
+
+        close_old_connections()
+        try:
+            if job_id is None:
+                # Jobs left RUNNING by a process that died mid-job would otherwise never finish
+                requeue_stale_jobs(settings.RECOMMENDATION_JOB_STALE_SECONDS)
+                run_pending_jobs()
+            else:
+                run_job(job_id)
+        except Exception as e:
+            logger.error(f"Recommendation worker error: {str(e)}")
+        finally:
+            close_old_connections()
+
+
+def claim_job(job_id):
+    """
+    Atomically move a job from PENDING to RUNNING
+
+    Returns:
+        True if this caller owns the job, False if another worker got it first
+    """
+    claimed = RecommendationJob.objects.filter(pk=job_id, status='PENDING').update(
+        status='RUNNING',
+        started_at=timezone.now()
+    )
+    return claimed == 1
+
+
+def run_job(job_id, on_result=None):
+    """
+    Claim and execute a single job
+
+    Args:
+        job_id: Primary key of the RecommendationJob
+        on_result: Optional per-career callback passed to generate_recommendations
+
+    Returns:
+        True if the job was processed here, False if it was already claimed
+    """
+    if not claim_job(job_id):
+        return False
+
+    job = RecommendationJob.objects.select_related('user').get(pk=job_id)
+    from .frontend_views import generate_recommendations
+
+    try:
+        # The answers were written moments ago; a replica may not have them yet
+        with use_primary(), capture_slow_queries(f"recommendation job {job.pk}"):
+            succeeded = generate_recommendations(job.user, on_result=on_result, changes=job.changes)
+        # The results page is usually the next thing the user loads
+        pin_user(job.user_id)
+        job.status = 'DONE' if succeeded else 'FAILED'
+        if not succeeded:
+            job.error = 'Recommendations could not be generated'
+    except Exception as e:
+        logger.error(f"Recommendation job {job.pk} failed: {str(e)}")
+        job.status = 'FAILED'
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    logger.info(f"Recommendation job {job.pk} finished with status {job.status}")
+    return True
+
+
+def run_pending_jobs(limit=None):
+    """
+    Process pending jobs in submission order
+
+    Returns:
+        Number of jobs processed by this caller
+    """
+    grace = timezone.now() - timedelta(seconds=getattr(settings, 'RECOMMENDATION_STREAM_GRACE_SECONDS', 5))
+    pending = RecommendationJob.objects.filter(status='PENDING').exclude(
+        streaming=True, created_at__gt=grace
+    ).order_by('created_at')
+    if limit:
+        pending = pending[:limit]
+
+    processed = 0
+    for job_id in pending.values_list('pk', flat=True):
+        if run_job(job_id):
+            processed += 1
+    return processed
+
+
+def requeue_stale_jobs(timeout_seconds):
+    """Return RUNNING jobs abandoned by a dead worker to the queue"""
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    requeued = RecommendationJob.objects.filter(status='RUNNING', started_at__lt=cutoff).update(
+        status='PENDING',
+        started_at=None
+    )
+    if requeued:
+        logger.warning("Requeued %d stale recommendation jobs", requeued)
+    return requeued
@@ -0,0 +1,102 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from career_counseling.pdf_benchmark import (
+    FIXTURE_SIZES, build_fixture, compare_to_baseline, load_baseline, run_benchmarks, write_baseline
+)
+from career_counseling.pdf_generator import build_theme, generate_pdf_report
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks PDF report generation across fixture sizes and checks it against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10,
+                            help='Reports to render per fixture size')
+        parser.add_argument('--sizes', nargs='+', choices=list(FIXTURE_SIZES), default=None,
+                            help='Fixture sizes to run (default: all)')
+        parser.add_argument('--save-baseline', metavar='PATH', default=None,
+                            help='Write the results to a JSON baseline file')
+        parser.add_argument('--check', metavar='PATH', default=None,
+                            help='Compare the results with a baseline file and fail on regressions')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed fractional increase over the baseline (default: 0.25)')
+        parser.add_argument('--compare-theme', action='store_true',
+                            help='Time the cached theme against rebuilding it per report instead')
+        parser.add_argument('--repeats', type=int, default=9,
+                            help='Repeats to take the median over with --compare-theme')
+
+    def handle(self, *args, **options):
+        if options['compare_theme']:
+            return self._compare_theme(max(1, options['iterations']), max(1, options['repeats']))
+
+        results = run_benchmarks(options['sizes'], options['iterations'])
+
+        self.stdout.write(f"{'size':<8} {'mean ms':>9} {'min ms':>9} {'bytes':>9} {'pages':>6} {'peak KB':>9}")
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name:<8} {metrics['mean_ms']:>9.2f} {metrics['min_ms']:>9.2f} "
+                f"{metrics['bytes']:>9} {metrics['pages']:>6} {metrics['peak_kb']:>9.1f}"
+            )
+
+        if options['save_baseline']:
+            write_baseline(results, options['save_baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['save_baseline']}"))
+
+        if options['check']:
+            try:
+                baseline = load_baseline(options['check'])
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read baseline {options['check']}: {str(e)}")
+
+            regressions = compare_to_baseline(results, baseline, options['tolerance'])
+            for message in regressions:
+                self.stderr.write(self.style.ERROR(message))
+            if regressions:
+                raise CommandError(f'{len(regressions)} PDF benchmark regressions')
+            self.stdout.write(self.style.SUCCESS('All PDF benchmarks within baseline'))
+
+    def _compare_theme(self, iterations, repeats):
+        user, report, recommendations = build_fixture(*FIXTURE_SIZES['medium'])
+        variants = {
+            'cached': lambda: generate_pdf_report(user, report, recommendations),
+            'rebuilt': lambda: generate_pdf_report(user, report, recommendations, theme=build_theme()),
+        }
+
+        # Warm up imports, font loading and allocator pools before timing
+        for _ in range(3):
+            for render in variants.values():
+                render()
+
+        # Renders alternate between the variants, and which goes first alternates too, so
+        # drift in machine load hits both equally; each repeat yields one mean per variant
+        means = {name: [] for name in variants}
+        for repeat in range(repeats):
+            order = list(variants) if repeat % 2 == 0 else list(reversed(variants))
+            totals = dict.fromkeys(variants, 0.0)
+            for _ in range(iterations):
+                for name in order:
+                    start = time.perf_counter()
+                    variants[name]()
+                    totals[name] += time.perf_counter() - start
+            for name, total in totals.items():
+                means[name].append(total / iterations)
+
+        cached = statistics.median(means['cached'])
+        rebuilt = statistics.median(means['rebuilt'])
+        theme_ms = statistics.median(self._time_once(build_theme) for _ in range(max(5, iterations)))
+
+        self.stdout.write(f'Medians of {repeats} repeats of {iterations} interleaved renders each')
+        self.stdout.write(f'Theme rebuilt per report: {rebuilt * 1000:.2f} ms/report')
+        self.stdout.write(f'Cached module theme:      {cached * 1000:.2f} ms/report')
+        self.stdout.write(f'build_theme() alone:      {theme_ms * 1000:.2f} ms')
+        self.stdout.write(self.style.SUCCESS(
+            f'Saved {(rebuilt - cached) * 1000:.2f} ms per report ({(rebuilt - cached) / rebuilt:.1%} of render time)'
+        ))
+
+    def _time_once(self, func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from career_counseling.models import AssessmentReport, AssessmentSubmission, CareerRecommendation, Question
+
+
+def hot_queries():
+    """(description, queryset, expected index) for the per-user queries the views run"""
+    return [
+        ('recommendations by user, best first',
+         CareerRecommendation.objects.filter(user_id=1).order_by('-confidence_score'),
+         'careerrec_user_score_idx'),
+        ('latest report for user',
+         AssessmentReport.objects.filter(user_id=1).order_by('-created_at'),
+         'report_user_created_idx'),
+        ('assessment attempts by user, newest first',
+         AssessmentSubmission.objects.filter(user_id=1).order_by('-created_at', '-id'),
+         'submission_user_created_idx'),
+        ('questions by submitted text',
+         Question.objects.filter(question_text_hash__in=[Question.hash_text('example question')]),
+         'question_text_hash_idx'),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Checks that the per-user hot queries are planned against their composite indexes (SQLite and PostgreSQL)'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Query plan checks support SQLite and PostgreSQL, not {connection.vendor}')
+
+        failures = 0
+        for description, queryset, index in hot_queries():
+            plan = self._explain(queryset)
+            problem = self._check_plan(plan, index)
+            if problem:
+                failures += 1
+                self.stderr.write(self.style.ERROR(f'FAIL {description}: {problem}'))
+                self.stderr.write(plan)
+            else:
+                self.stdout.write(f'ok   {description} ({index})')
+
+        if failures:
+            raise CommandError(f'{failures} queries are not using their indexes')
+        self.stdout.write(self.style.SUCCESS('All hot queries use their indexes'))
+
+    def _explain(self, queryset):
+        if connection.vendor == 'sqlite':
+            return queryset.explain()
+
+        # Tiny development tables make PostgreSQL prefer sequential scans; this checks the index is usable
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
+
+    def _check_plan(self, plan, index):
+        if index not in plan:
+            return f'plan does not use {index}'
+        if connection.vendor == 'sqlite' and 'TEMP B-TREE' in plan:
+            return 'index is used but rows are still sorted in a temporary b-tree'
+        if connection.vendor == 'postgresql' and 'Sort' in plan:
+            return 'index is used but rows are still sorted separately'
+        return None
@@ -0,0 +1,57 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from career_counseling.models import SlowQuery
+
+
+class Command(BaseCommand):
+    help = 'Prints the captured slow queries, newest first, with their stack summaries and EXPLAIN plans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20,
+                            help='Queries to print')
+        parser.add_argument('--min-ms', type=float, default=0,
+                            help='Only print queries at least this slow')
+        parser.add_argument('--source', default=None,
+                            help='Only print queries from this route name or job')
+        parser.add_argument('--json', action='store_true',
+                            help='Print one JSON object per line instead of text')
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete every captured query after printing')
+
+    def handle(self, *args, **options):
+        queries = SlowQuery.objects.filter(duration_ms__gte=options['min_ms'])
+        if options['source']:
+            queries = queries.filter(source=options['source'])
+
+        for query in queries[:max(0, options['limit'])]:
+            if options['json']:
+                self.stdout.write(json.dumps({
+                    'created_at': query.created_at.isoformat(),
+                    'database': query.database,
+                    'source': query.source,
+                    'duration_ms': round(query.duration_ms, 2),
+                    'sql': query.sql,
+                    'params_hash': query.params_hash,
+                    'stack': query.stack.splitlines(),
+                    'plan': query.plan.splitlines(),
+                }))
+            else:
+                self._write_text(query)
+
+        if options['clear']:
+            deleted, _ = SlowQuery.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} captured queries'))
+
+    def _write_text(self, query):
+        self.stdout.write(self.style.WARNING(
+            f'{query.created_at:%Y-%m-%d %H:%M:%S}  {query.duration_ms:.1f}ms  '
+            f'{query.source or "-"} ({query.database}, params {query.params_hash})'
+        ))
+        self.stdout.write(query.sql)
+        for line in query.stack.splitlines():
+            self.stdout.write(f'  at {line}')
+        for line in query.plan.splitlines():
+            self.stdout.write(f'  plan: {line}')
+        self.stdout.write('')
@@ -0,0 +1,106 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from career_counseling import render_worker
+from career_counseling.models import AssessmentReport, CareerRecommendation
+
+
+class Command(BaseCommand):
+    help = 'Renders PDF reports for a group of users in parallel and writes them to a ZIP archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Path of the ZIP archive to write')
+        parser.add_argument('--users', nargs='+', default=None,
+                            help='Usernames to export')
+        parser.add_argument('--group', default=None,
+                            help='Only export members of this auth group')
+        parser.add_argument('--username-prefix', default=None,
+                            help='Only export usernames starting with this prefix')
+        parser.add_argument('--joined-after', default=None,
+                            help='Only export users who joined on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help='Render processes to use')
+
+    def handle(self, *args, **options):
+        users = self._select_users(options)
+        jobs = self._load_jobs(users)
+        if not jobs:
+            raise CommandError('No matching users have an assessment report')
+
+        processes = max(1, options['processes'])
+        self.stdout.write(f'Rendering {len(jobs)} reports with {processes} processes')
+
+        start = time.perf_counter()
+        total_pages = 0
+        pending = set()
+        jobs = iter(jobs)
+
+        with zipfile.ZipFile(options['output'], 'w', compression=zipfile.ZIP_DEFLATED) as archive, \
+                ProcessPoolExecutor(max_workers=processes,
+                                    mp_context=multiprocessing.get_context('spawn'),
+                                    initializer=render_worker.init_worker) as pool:
+            # Keep a bounded number of renders in flight so finished PDFs are written out promptly
+            while True:
+                for user, report, recommendations in jobs:
+                    future = pool.submit(render_worker.render_pdf, user, report, recommendations)
+                    future.username = user.username
+                    pending.add(future)
+                    if len(pending) >= processes * 2:
+                        break
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    data, pages = future.result()
+                    archive.writestr(f'{future.username}_career_report.pdf', data)
+                    total_pages += pages
+                    self.stdout.write(f'  {future.username}: {pages} pages')
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {total_pages} pages to {options["output"]} in {elapsed:.2f}s '
+            f'({total_pages / elapsed:.1f} pages/s)'
+        ))
+
+    def _select_users(self, options):
+        users = User.objects.all()
+        if options['users']:
+            users = users.filter(username__in=options['users'])
+        if options['group']:
+            users = users.filter(groups__name=options['group'])
+        if options['username_prefix']:
+            users = users.filter(username__startswith=options['username_prefix'])
+        if options['joined_after']:
+            try:
+                joined_after = datetime.strptime(options['joined_after'], '%Y-%m-%d')
+            except ValueError:
+                raise CommandError('--joined-after must be in YYYY-MM-DD format')
+            users = users.filter(date_joined__date__gte=joined_after.date())
+        return users
+
+    def _load_jobs(self, users):
+        """Fetch the latest report and all recommendations for every user in two queries"""
+        reports = {}
+        for report in AssessmentReport.objects.filter(user__in=users).select_related('user').order_by('-created_at'):
+            reports.setdefault(report.user_id, report)
+
+        recommendations = {}
+        for rec in (CareerRecommendation.objects.filter(user_id__in=list(reports))
+                    .select_related('career_path')
+                    .order_by('-confidence_score')):
+            recommendations.setdefault(rec.user_id, []).append(rec)
+
+        return [
+            (report.user, report, recommendations[user_id])
+            for user_id, report in reports.items()
+            if user_id in recommendations
+        ]
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from career_counseling.jobs import requeue_stale_jobs, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Processes queued recommendation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the pending queue and exit')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=settings.RECOMMENDATION_JOB_STALE_SECONDS,
+                            help='Requeue RUNNING jobs older than this many seconds')
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            requeued = requeue_stale_jobs(options['stale_after'])
+            if requeued:
+                self.stdout.write(f'Requeued {requeued} stale jobs')
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(f'Processed {processed} jobs')
+
+            if options['once']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('Job queue drained'))
@@ -0,0 +1,189 @@
+"""
+Prometheus Metrics
+Request latency histograms and business counters exported at /metrics
+
+prometheus_client is optional: without it every recorder is a no-op and the endpoint
+answers 503. When PROMETHEUS_MULTIPROC_DIR is set (before the process starts), every
+gunicorn worker, job worker and render process writes its samples to files in that
+directory and a scrape of any one process aggregates all of them.
+"""
+
+import os
+import threading
+
+REQUEST_QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+PDF_SIZE_BUCKETS = (16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6, 4e6, 8e6)
+CACHE_RESULTS = ('local_hits', 'shared_hits', 'misses')
+
+
+class _Metrics:
+    """The metric objects, created once per process"""
+
+    def __init__(self, prometheus_client):
+        Counter, Gauge, Histogram = prometheus_client.Counter, prometheus_client.Gauge, prometheus_client.Histogram
+        self.request_seconds = Histogram(
+            'counselbot_request_duration_seconds', 'Request wall time by URL name',
+            ['route', 'method', 'status'],
+        )
+        self.request_queries = Histogram(
+            'counselbot_request_queries', 'Database queries per request by URL name',
+            ['route'], buckets=REQUEST_QUERY_BUCKETS,
+        )
+        self.prediction_seconds = Histogram(
+            'counselbot_predictor_inference_seconds', 'CareerPredictor inference time', ['method'],
+        )
+        self.scoring_seconds = Histogram(
+            'counselbot_scoring_seconds', 'Time to produce a user\'s recommendation scores',
+            ['source'],
+        )
+        self.pdf_render_seconds = Histogram(
+            'counselbot_pdf_render_seconds', 'Time to render and store a PDF report',
+        )
+        self.pdf_size_bytes = Histogram(
+            'counselbot_pdf_size_bytes', 'Size of rendered PDF reports', buckets=PDF_SIZE_BUCKETS,
+        )
+        self.render_queue_depth = Gauge(
+            'counselbot_report_render_queue_depth', 'Background PDF renders in flight',
+            multiprocess_mode='livesum',
+        )
+        self.cache_lookups = Counter(
+            'counselbot_cache_lookups_total', 'Tiered cache lookups by cache and result',
+            ['cache', 'result'],
+        )
+        self.request_cache_lookups = Counter(
+            'counselbot_request_cache_lookups_total', 'Tiered cache lookups made by requests by URL name and result',
+            ['route', 'result'],
+        )
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def _get():
+    """The process's metrics, or None when prometheus_client is not installed"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                try:
+                    import prometheus_client
+                except ImportError:
+                    _metrics = False
+                else:
+                    _metrics = _Metrics(prometheus_client)
+    return _metrics or None
+
+
+def observe_request(route, method, status, seconds, queries, cache=None):
+    """cache maps each of CACHE_RESULTS to the request's lookup count"""
+    metrics = _get()
+    if metrics:
+        metrics.request_seconds.labels(route, method, str(status)).observe(seconds)
+        metrics.request_queries.labels(route).observe(queries)
+        for result, count in (cache or {}).items():
+            if count:
+                metrics.request_cache_lookups.labels(route, result).inc(count)
+
+
+def observe_prediction(method, seconds):
+    metrics = _get()
+    if metrics:
+        metrics.prediction_seconds.labels(method).observe(seconds)
+
+
+def observe_scoring(source, seconds):
+    """source is 'cached', 'incremental' or 'full'"""
+    metrics = _get()
+    if metrics:
+        metrics.scoring_seconds.labels(source).observe(seconds)
+
+
+def observe_pdf_render(seconds, size):
+    metrics = _get()
+    if metrics:
+        metrics.pdf_render_seconds.observe(seconds)
+        metrics.pdf_size_bytes.observe(size)
+
+
+def set_render_queue_depth(depth):
+    metrics = _get()
+    if metrics:
+        metrics.render_queue_depth.set(depth)
+
+
+def count_cache_lookup(cache, result):
+    metrics = _get()
+    if metrics:
+        metrics.cache_lookups.labels(cache, result).inc()
+
+
+class _ScrapeCollector:
+    """Process (or multiprocess) samples plus values computed at scrape time"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        lookups = {}
+        for family in self.source.collect():
+            if family.name == 'counselbot_cache_lookups':
+                for sample in family.samples:
+                    if sample.name.endswith('_total'):
+                        counts = lookups.setdefault(sample.labels['cache'], dict.fromkeys(CACHE_RESULTS, 0))
+                        counts[sample.labels['result']] = counts.get(sample.labels['result'], 0) + sample.value
+            yield family
+
+        ratios = GaugeMetricFamily(
+            'counselbot_cache_hit_ratio', 'Tiered cache hits (either tier) over lookups since start', labels=['cache'],
+        )
+        for cache, counts in sorted(lookups.items()):
+            total = sum(counts.values())
+            hits = counts['local_hits'] + counts['shared_hits']
+            ratios.add_metric([cache], hits / total if total else 0.0)
+        yield ratios
+
+        yield self._job_queue_depth()
+
+    def _job_queue_depth(self):
+        from django.db.models import Count
+        from prometheus_client.core import GaugeMetricFamily
+        from .models import RecommendationJob
+
+        depth = GaugeMetricFamily(
+            'counselbot_recommendation_jobs', 'Recommendation jobs waiting or running', labels=['status'],
+        )
+        counts = dict.fromkeys(('PENDING', 'RUNNING'), 0)
+        rows = (
+            RecommendationJob.objects.filter(status__in=list(counts))
+            .order_by().values_list('status').annotate(total=Count('id'))
+        )
+        counts.update(rows)
+        for status, total in counts.items():
+            depth.add_metric([status], total)
+        return depth
+
+
+def render_metrics():
+    """
+    Render every metric in the Prometheus text format
+
+    Returns:
+        (body, content_type) tuple, or None when prometheus_client is not installed
+    """
+    if not _get():
+        return None
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        source = CollectorRegistry()
+        multiprocess.MultiProcessCollector(source)
+    else:
+        source = REGISTRY
+
+    registry = CollectorRegistry()
+    registry.register(_ScrapeCollector(source))
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0005_recommendationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationjob',
+            name='streaming',
+            field=models.BooleanField(default=False),
+        ),
+    ]
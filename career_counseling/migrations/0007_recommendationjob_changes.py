@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0006_recommendationjob_streaming'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationjob',
+            name='changes',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
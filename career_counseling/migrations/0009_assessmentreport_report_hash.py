@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0008_assessmentsubmission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentreport',
+            name='report_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:35
+
+import hashlib
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_question_text_hash(apps, schema_editor):
+    # Historical models do not have Question.save, so hash here
+    Question = apps.get_model('career_counseling', 'Question')
+    questions = list(Question.objects.all())
+    for question in questions:
+        question.question_text_hash = hashlib.sha256(question.question_text.encode('utf-8')).hexdigest()
+    Question.objects.bulk_update(questions, ['question_text_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0009_assessmentreport_report_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='question_text_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_question_text_hash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='assessmentreport',
+            index=models.Index(fields=['user', '-created_at'], name='report_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='careerrecommendation',
+            index=models.Index(fields=['user', '-confidence_score'], name='careerrec_user_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['question_text_hash'], name='question_text_hash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userresponse',
+            index=models.Index(fields=['user', '-created_at'], name='response_user_created_idx'),
+        ),
+    ]
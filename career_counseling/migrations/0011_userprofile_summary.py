@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:41
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_profile_summary(apps, schema_editor):
+    # Historical models do not have UserProfile.save, so compute completion here
+    UserProfile = apps.get_model('career_counseling', 'UserProfile')
+    profiles = list(
+        UserProfile.objects.select_related('user').annotate(
+            submissions=Count('user__assessmentsubmission', distinct=True),
+            recommendations=Count('user__careerrecommendation', distinct=True),
+        )
+    )
+    for profile in profiles:
+        completed_fields = sum([
+            bool(profile.user.first_name),
+            bool(profile.user.last_name),
+            bool(profile.education_level),
+            bool(profile.field_of_study)
+        ])
+        profile.profile_completion = int(completed_fields / 4 * 100)
+        profile.submission_count = profile.submissions
+        profile.recommendation_count = profile.recommendations
+    UserProfile.objects.bulk_update(profiles, ['profile_completion', 'submission_count', 'recommendation_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0010_question_text_hash_and_user_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='profile_completion',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='recommendation_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='submission_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_profile_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0011_userprofile_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('database', models.CharField(max_length=32)),
+                ('source', models.CharField(blank=True, max_length=200)),
+                ('duration_ms', models.FloatField()),
+                ('sql', models.TextField()),
+                ('params_hash', models.CharField(max_length=16)),
+                ('stack', models.TextField()),
+                ('plan', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-id'],
+            },
+        ),
+    ]
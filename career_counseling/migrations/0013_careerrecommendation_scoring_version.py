@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0012_slowquery'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='scoring_version',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
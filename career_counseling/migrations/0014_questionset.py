@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:02
+
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_current_submissions(apps, schema_editor):
+    # Submissions recorded against the current questions can still be decoded; snapshot them.
+    # Older ones were already unreadable and are left without a question set.
+    Question = apps.get_model('career_counseling', 'Question')
+    QuestionSet = apps.get_model('career_counseling', 'QuestionSet')
+    AssessmentSubmission = apps.get_model('career_counseling', 'AssessmentSubmission')
+
+    questions = list(Question.objects.order_by('id'))
+    old_version = hashlib.sha256(
+        json.dumps([[q.id, q.question_type, q.options] for q in questions]).encode('utf-8')
+    ).hexdigest()
+    current = AssessmentSubmission.objects.filter(question_set_version=old_version)
+    if not current.exists():
+        return
+
+    rows = [[q.id, q.question_type, q.question_text, q.options] for q in questions]
+    version = hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()
+    question_set, created = QuestionSet.objects.get_or_create(version=version, defaults={'questions': rows})
+    current.update(question_set=question_set)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0013_careerrecommendation_scoring_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=64, unique=True)),
+                ('questions', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='assessmentsubmission',
+            name='question_set',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, to='career_counseling.questionset'),
+        ),
+        migrations.RunPython(link_current_submissions, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='assessmentsubmission',
+            name='question_set_version',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:08
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+
+def delete_unreferenced_bodies(apps, schema_editor):
+    # Stored reports are complete PDFs until they are next rendered, so no report refers to the
+    # bodies written so far; they are rendered again on demand.
+    try:
+        shards = default_storage.listdir('reports/bodies')[0]
+        for shard in shards:
+            for name in default_storage.listdir(f'reports/bodies/{shard}')[1]:
+                default_storage.delete(f'reports/bodies/{shard}/{name}')
+    except (OSError, NotImplementedError):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0014_questionset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessmentreport',
+            name='body_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(delete_unreferenced_bodies, migrations.RunPython.noop),
+    ]
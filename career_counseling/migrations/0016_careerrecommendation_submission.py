@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0015_assessmentreport_body_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='careerrecommendation',
+            name='submission',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='career_counseling.assessmentsubmission'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('career_counseling', '0016_careerrecommendation_submission'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='userresponse',
+            name='response_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='assessmentsubmission',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='submission_user_created_idx'),
+        ),
+    ]
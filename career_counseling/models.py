@@ -1,6 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from collections import namedtuple
+import hashlib
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -8,9 +15,30 @@ class UserProfile(models.Model):
     field_of_study = models.CharField(max_length=100, blank=True, null=True)
     skills = models.JSONField(default=dict)
     interests = models.JSONField(default=dict)
+    # Per-user summary kept current on write, so the profile page needs no counting queries
+    profile_completion = models.PositiveSmallIntegerField(default=0)
+    submission_count = models.PositiveIntegerField(default=0)
+    recommendation_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    def compute_completion(self):
+        """Percentage of the four profile fields the user has filled in"""
+        completed_fields = sum([
+            bool(self.user.first_name),
+            bool(self.user.last_name),
+            bool(self.education_level),
+            bool(self.field_of_study)
+        ])
+        return int(completed_fields / 4 * 100)
+
+    def save(self, *args, **kwargs):
+        self.profile_completion = self.compute_completion()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'profile_completion'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.user.username}'s Profile"
 
@@ -23,11 +51,29 @@ class Question(models.Model):
     )
 
     question_text = models.TextField()
+    question_text_hash = models.CharField(max_length=64, blank=True, editable=False)  # indexed lookup key for question_text
     question_type = models.CharField(max_length=20, choices=QUESTION_TYPES)
     options = models.JSONField(default=list)
     weight = models.FloatField(default=1.0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['question_text_hash'], name='question_text_hash_idx'),
+        ]
+
+    @staticmethod
+    def hash_text(question_text):
+        """Lookup key for a question text; TextFields cannot be indexed directly on every backend"""
+        return hashlib.sha256(question_text.encode('utf-8')).hexdigest()
+
+    def save(self, *args, **kwargs):
+        self.question_text_hash = self.hash_text(self.question_text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'question_text' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | {'question_text_hash'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.question_type}: {self.question_text[:50]}..."
 
@@ -62,9 +108,18 @@ class CareerRecommendation(models.Model):
     confidence_score = models.FloatField()
     reasoning = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
+    # recommendation_cache.SCORING_VERSION of the rule-based scorer; null for model predictions
+    scoring_version = models.PositiveSmallIntegerField(null=True, blank=True)
+    # Assessment attempt the score was computed from; null for answers given through the API
+    submission = models.ForeignKey(
+        'AssessmentSubmission', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
 
     class Meta:
         ordering = ['-confidence_score']
+        indexes = [
+            models.Index(fields=['user', '-confidence_score'], name='careerrec_user_score_idx'),
+        ]
 
     def __str__(self):
         return f"{self.career_path.title} recommendation for {self.user.username}"
@@ -77,6 +132,181 @@ class AssessmentReport(models.Model):
     personality_insights = models.JSONField()
     created_at = models.DateTimeField(auto_now_add=True)
     report_file = models.FileField(upload_to='reports/', null=True, blank=True)
+    report_hash = models.CharField(max_length=64, blank=True)  # content hash of the complete report
+    # Shared body that report_file is the cover for; empty when report_file is the complete report
+    body_hash = models.CharField(max_length=64, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='report_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Career Assessment Report for {self.user.username}"
+
+class RecommendationJob(models.Model):
+    STATUS_CHOICES = (
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING', db_index=True)
+    error = models.TextField(blank=True)
+    streaming = models.BooleanField(default=False)
+    changes = models.JSONField(null=True, blank=True)  # answer changes for incremental rescoring
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    def __str__(self):
+        return f"Recommendation job {self.id} for {self.user.username} ({self.status})"
+
+
+# Per-answer view of a packed submission; mirrors the UserResponse attributes templates use
+SubmittedAnswer = namedtuple('SubmittedAnswer', ['question', 'response_text', 'option_index'])
+
+
+class QuestionSet(models.Model):
+    """Snapshot of the questions a packed submission indexes into; never changes once written"""
+    version = models.CharField(max_length=64, unique=True)
+    questions = models.JSONField()  # [id, question_type, question_text, options] per question, in packing order
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def snapshot(questions):
+        """
+        Snapshot rows and version hash for a list of questions
+
+        Returns:
+            (version, rows) tuple
+        """
+        rows = [[q.id, q.question_type, q.question_text, q.options] for q in questions]
+        version = hashlib.sha256(json.dumps(rows).encode('utf-8')).hexdigest()
+        return version, rows
+
+    def unpack(self):
+        """Unsaved Question objects as they were when the snapshot was taken"""
+        return [
+            Question(id=question_id, question_type=question_type, question_text=question_text, options=options)
+            for question_id, question_type, question_text, options in self.questions
+        ]
+
+    def __str__(self):
+        return f"Question set {self.version[:12]} ({len(self.questions)} questions)"
+
+
+class AssessmentSubmissionManager(models.Manager):
+    # Marks an answer that is missing or not one of the question's options
+    NO_OPTION = 0xFF
+
+    def current_question_set(self):
+        """QuestionSet for the current catalog, created the first time the catalog is seen"""
+        from .catalog import get_questions
+
+        version, rows = QuestionSet.snapshot(get_questions())
+        question_set, created = QuestionSet.objects.get_or_create(version=version, defaults={'questions': rows})
+        return question_set
+
+    def record(self, user, answers):
+        """
+        Store a whole assessment attempt as one row
+
+        Args:
+            user: Django User object
+            answers: List of (Question, response_text) tuples
+
+        Returns:
+            AssessmentSubmission instance
+        """
+        question_set = self.current_question_set()
+        submitted = {question.id: response_text for question, response_text in answers}
+
+        packed = bytearray()
+        for question_id, question_type, question_text, options in question_set.questions:
+            response_text = submitted.get(question_id)
+            if response_text in options and options.index(response_text) < self.NO_OPTION:
+                packed.append(options.index(response_text))
+            else:
+                packed.append(self.NO_OPTION)
+
+        submission = self.create(user=user, question_set=question_set, answers=bytes(packed))
+        UserProfile.objects.filter(user=user).update(submission_count=models.F('submission_count') + 1)
+        return submission
+
+    def latest_for(self, user):
+        """The user's most recent submission with its question set, or None"""
+        return self.filter(user=user).select_related('question_set').order_by('-created_at', '-id').first()
+
+
+class AssessmentSubmission(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Null only for attempts recorded before question sets were snapshotted and no longer decodable
+    question_set = models.ForeignKey(QuestionSet, on_delete=models.PROTECT, null=True)
+    answers = models.BinaryField()  # one option index per question of question_set, in its order
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = AssessmentSubmissionManager()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='submission_user_created_idx'),
+        ]
+
+    def answer_items(self):
+        """
+        Unpack the stored option indices against the question set they were recorded with
+
+        Returns:
+            List of SubmittedAnswer tuples, one per question in the set
+        """
+        if self.question_set is None:
+            logger.warning("Submission %s has no question set to decode against", self.id)
+            return []
+
+        items = []
+        for question, option_index in zip(self.question_set.unpack(), bytes(self.answers)):
+            if option_index == AssessmentSubmission.objects.NO_OPTION:
+                items.append(SubmittedAnswer(question, None, None))
+            else:
+                items.append(SubmittedAnswer(question, question.options[option_index], option_index))
+        return items
+
+    @property
+    def responses(self):
+        """Per-answer access for templates; only the questions that were answered"""
+        return [item for item in self.answer_items() if item.response_text is not None]
+
+    @property
+    def answered_count(self):
+        """Answered questions, counted without decoding against the question set"""
+        return sum(1 for option_index in bytes(self.answers) if option_index != AssessmentSubmission.objects.NO_OPTION)
+
+    def __str__(self):
+        return f"{self.user.username}'s assessment submitted {self.created_at:%Y-%m-%d %H:%M}"
+
+
+class SlowQuery(models.Model):
+    """A captured slow query from career_counseling code; kept to the newest SLOW_QUERY_LIMIT rows"""
+    created_at = models.DateTimeField(auto_now_add=True)
+    database = models.CharField(max_length=32)
+    source = models.CharField(max_length=200, blank=True)  # route name or job that ran it
+    duration_ms = models.FloatField()
+    sql = models.TextField()
+    params_hash = models.CharField(max_length=16)
+    stack = models.TextField()
+    plan = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name_plural = 'slow queries'
 
     def __str__(self):
-        return f"Career Assessment Report for {self.user.username}" 
\ No newline at end of file
+        return f"{self.duration_ms:.0f}ms {self.sql[:80]}"
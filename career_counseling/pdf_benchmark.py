@@ -0,0 +1,147 @@
+"""
+PDF Generation Benchmarks
+Synthetic report fixtures at several sizes, timing and size metrics for generate_pdf_report,
+and a JSON baseline to check later runs against
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from .models import AssessmentReport, CareerPath, CareerRecommendation
+from .pdf_generator import count_pdf_pages, generate_pdf_report
+
+# name -> (recommendations, analysis entries per section, characters per answer)
+FIXTURE_SIZES = {
+    'small': (3, 3, 20),
+    'medium': (8, 6, 40),
+    'large': (25, 40, 200),
+    'xlarge': (100, 200, 800),
+}
+
+# Metrics compared against the baseline; pages must match exactly
+CHECKED_METRICS = ('mean_ms', 'bytes', 'peak_kb')
+
+
+def build_fixture(recommendation_count, analysis_entries, answer_length):
+    """
+    Unsaved user, report and recommendations shaped like a completed assessment
+
+    Returns:
+        (user, report, recommendations) tuple
+    """
+    user = User(id=1, username='benchmark', first_name='Bench', last_name='Mark', email='bench@example.com')
+    answer = ('Working with Technology and people ' * (answer_length // 35 + 1))[:answer_length]
+    report = AssessmentReport(
+        id=1,
+        user=user,
+        created_at=timezone.now(),
+        skill_analysis={f'Response {i}': answer for i in range(1, analysis_entries + 1)},
+        interest_analysis={f'Response {i}': answer for i in range(1, analysis_entries + 1)},
+        personality_insights={f'Trait {i}': answer for i in range(1, analysis_entries + 1)},
+    )
+    recommendations = [
+        CareerRecommendation(
+            user=user,
+            career_path=CareerPath(id=i, title=f'Career Path {i}', average_salary='$80,000 - $110,000'),
+            confidence_score=max(0.0, 0.95 - i * 0.01),
+            reasoning='Your assessment responses align with the requirements for this career path. '
+                      'Average salary: $80,000 - $110,000.'
+        )
+        for i in range(1, recommendation_count + 1)
+    ]
+    return user, report, recommendations
+
+
+def measure(user, report, recommendations, iterations=10):
+    """
+    Time generate_pdf_report and record output size, page count and peak memory
+
+    Memory is traced in a separate run so tracemalloc overhead does not skew the timings.
+    """
+    # Warm up imports, fonts and the chart cache before timing
+    data = generate_pdf_report(user, report, recommendations).getvalue()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        generate_pdf_report(user, report, recommendations)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        generate_pdf_report(user, report, recommendations)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'mean_ms': round(sum(timings) / len(timings) * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'bytes': len(data),
+        'pages': count_pdf_pages(data),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(sizes=None, iterations=10):
+    """
+    Measure every fixture size
+
+    Returns:
+        Dict of size name -> metrics dict
+    """
+    results = {}
+    for name in sizes or FIXTURE_SIZES:
+        results[name] = measure(*build_fixture(*FIXTURE_SIZES[name]), iterations=iterations)
+    return results
+
+
+def write_baseline(results, path):
+    """Save benchmark results as the baseline for later comparisons"""
+    baseline = {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Check results against a baseline
+
+    Args:
+        results: Output of run_benchmarks
+        baseline: Results dict loaded from a baseline file
+        tolerance: Allowed fractional increase for time, bytes and memory
+
+    Returns:
+        List of regression messages, empty when everything is within budget
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for metric in CHECKED_METRICS:
+            limit = expected[metric] * (1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {metrics[metric]} exceeds baseline {expected[metric]} "
+                    f"by more than {tolerance:.0%}"
+                )
+        if metrics['pages'] != expected['pages']:
+            regressions.append(f"{name}: page count changed from {expected['pages']} to {metrics['pages']}")
+    return regressions
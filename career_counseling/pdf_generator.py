@@ -4,19 +4,492 @@ Professional design with optimized layout and dynamic content
 """
 
 from io import BytesIO
+from copy import copy
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib import colors
+from reportlab.graphics.shapes import Drawing, Group, String, UserNode
+from reportlab.graphics.charts.barcharts import HorizontalBarChart
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from datetime import datetime
 import json
 import logging
+import re
+import zlib
 
 logger = logging.getLogger(__name__)
 
-def generate_pdf_report(user, report, recommendations):
+
+@dataclass(frozen=True)
+class ReportTheme:
+    """Prebuilt styles and static flowables shared by every generated report"""
+    styles: MappingProxyType
+    recommendations_table_style: TableStyle
+    flowables: MappingProxyType
+
+    def flowable(self, name):
+        """Copy of a static flowable; copies keep the parsed markup but get their own layout state"""
+        return copy(self.flowables[name])
+
+
+def build_theme():
+    """Build the report styles, table style and static text once"""
+    base = getSampleStyleSheet()
+    
+    # Custom professional styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=base['Heading1'],
+        fontSize=20,
+        textColor=colors.HexColor('#1f4788'),
+        spaceAfter=12,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=base['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#2E86AB'),
+        spaceAfter=8,
+        spaceBefore=16,
+        fontName='Helvetica-Bold',
+        borderPadding=5,
+        backColor=colors.HexColor('#F8F9FA')
+    )
+    
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=base['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#1f4788'),
+        spaceAfter=6,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    )
+    
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=base['Normal'],
+        fontSize=10,
+        alignment=TA_JUSTIFY,
+        spaceAfter=6,
+        leading=12
+    )
+    
+    bold_style = ParagraphStyle(
+        'CustomBold',
+        parent=normal_style,
+        fontName='Helvetica-Bold',
+        textColor=colors.HexColor('#333333')
+    )
+    
+    subtitle_style = ParagraphStyle(
+        'Subtitle',
+        parent=normal_style,
+        fontSize=12,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#666666')
+    )
+    
+    user_info_style = ParagraphStyle(
+        'UserInfo',
+        parent=normal_style,
+        alignment=TA_CENTER,
+        fontSize=11,
+        borderPadding=10,
+        backColor=colors.HexColor('#F0F8FF'),
+        borderColor=colors.HexColor('#1f4788'),
+        borderWidth=1
+    )
+    
+    confidential_style = ParagraphStyle(
+        'Confidential',
+        parent=normal_style,
+        alignment=TA_CENTER,
+        fontSize=8,
+        textColor=colors.HexColor('#999999')
+    )
+    
+    key_findings_style = ParagraphStyle(
+        'KeyFindings',
+        parent=normal_style,
+        backColor=colors.HexColor('#FFF8E1'),
+        borderColor=colors.HexColor('#FFC107'),
+        borderWidth=1,
+        borderPadding=10,
+        leftIndent=10,
+        rightIndent=10
+    )
+    
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=normal_style,
+        fontSize=8,
+        textColor=colors.HexColor('#666666'),
+        alignment=TA_CENTER
+    )
+    
+    # Professional table styling
+    recommendations_table_style = TableStyle([
+        # Header row
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        
+        # Data rows
+        ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Rank column
+        ('ALIGN', (2, 1), (2, -1), 'CENTER'),  # Score column
+        ('ALIGN', (1, 1), (1, -1), 'LEFT'),    # Career column
+        ('ALIGN', (3, 1), (3, -1), 'LEFT'),    # Description column
+        
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        
+        # Alternating row colors
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
+         [colors.white, colors.HexColor('#f8f9fa')]),
+        
+        # Grid lines
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dddddd')),
+        ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#1f4788')),
+        
+        # Padding
+        ('LEFTPADDING', (0, 0), (-1, -1), 6),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+    ])
+    
+    summary_text = """
+    This comprehensive career assessment report provides personalized career recommendations 
+    based on your unique combination of skills, interests, personality traits, and professional 
+    preferences. The analysis utilizes advanced machine learning algorithms to match your profile 
+    with suitable career paths in today's dynamic job market.
+    """
+    
+    next_steps_text = """
+    <b>1. Research Top Careers:</b> Explore the recommended career paths in detail<br/>
+    <b>2. Skill Development:</b> Identify key skills to develop for your top matches<br/>
+    <b>3. Networking:</b> Connect with professionals in your target industries<br/>
+    <b>4. Education Planning:</b> Research required education and certifications<br/>
+    <b>5. Career Counseling:</b> Schedule a session with a career advisor<br/>
+    """
+    
+    # Static text, parsed once
+    flowables = {
+        'cover_title': Paragraph("CAREER ASSESSMENT REPORT", title_style),
+        'cover_subtitle': Paragraph("Personalized Career Recommendations", subtitle_style),
+        'confidential': Paragraph("<i>Confidential Assessment Report - For Personal Use Only</i>", confidential_style),
+        'summary_heading': Paragraph("Executive Summary", heading_style),
+        'summary': Paragraph(summary_text, normal_style),
+        'recommendations_heading': Paragraph("Top Career Recommendations", heading_style),
+        'no_recommendations': Paragraph("No career recommendations available.", normal_style),
+        'analysis_heading': Paragraph("Detailed Analysis", heading_style),
+        'skills_heading': Paragraph("Skills Assessment", subheading_style),
+        'interests_heading': Paragraph("Interests Profile", subheading_style),
+        'personality_heading': Paragraph("Personality Insights", subheading_style),
+        'next_steps_heading': Paragraph("Recommended Next Steps", subheading_style),
+        'next_steps': Paragraph(next_steps_text, normal_style),
+        'body_footer': Paragraph(
+            "<i>This report was generated by CounselBot AI Career Assessment System.<br/>"
+            "For personalized career counseling or additional support, please contact our career advisors.</i>",
+            footer_style
+        ),
+    }
+    
+    return ReportTheme(
+        styles=MappingProxyType({
+            'title': title_style,
+            'heading': heading_style,
+            'subheading': subheading_style,
+            'normal': normal_style,
+            'bold': bold_style,
+            'subtitle': subtitle_style,
+            'user_info': user_info_style,
+            'confidential': confidential_style,
+            'key_findings': key_findings_style,
+            'footer': footer_style,
+        }),
+        recommendations_table_style=recommendations_table_style,
+        flowables=MappingProxyType(flowables),
+    )
+
+
+# Built once per process; only per-user content is assembled per report
+THEME = build_theme()
+
+
+CHART_CAREERS = 5
+
+
+@lru_cache(maxsize=256)
+def build_score_chart(entries):
+    """
+    Lay out the top-careers bar chart for one score vector
+    
+    Args:
+        entries: Tuple of (career title, match percentage) pairs, best match first
+    
+    Returns:
+        (width, height, shapes) tuple; the chart layout is resolved into primitive
+        shapes once, and score_chart copies them into a new drawing for each report
+    """
+    bar_height = 0.35*inch
+    width = 6.0*inch
+    height = bar_height * len(entries) + 0.7*inch
+    
+    chart = HorizontalBarChart()
+    chart.x = 2.0*inch
+    chart.y = 0.3*inch
+    chart.width = width - chart.x - 0.3*inch
+    chart.height = bar_height * len(entries)
+    
+    # Categories are drawn bottom-up, so reverse to put the best match on top
+    chart.data = [[score for _, score in reversed(entries)]]
+    chart.categoryAxis.categoryNames = [
+        title if len(title) <= 30 else title[:29] + '…'
+        for title, _ in reversed(entries)
+    ]
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.categoryAxis.labels.dx = -6
+    chart.categoryAxis.labels.textAnchor = 'end'
+    chart.categoryAxis.strokeColor = colors.HexColor('#dddddd')
+    
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 100
+    chart.valueAxis.valueStep = 20
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.labelTextFormat = '%d%%'
+    chart.valueAxis.strokeColor = colors.HexColor('#dddddd')
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = colors.HexColor('#eeeeee')
+    
+    chart.bars[0].fillColor = colors.HexColor('#2E86AB')
+    chart.bars[0].strokeColor = None
+    chart.barLabelFormat = '%d%%'
+    chart.barLabels.fontName = 'Helvetica-Bold'
+    chart.barLabels.fontSize = 8
+    chart.barLabels.boxAnchor = 'w'
+    chart.barLabels.dx = 4
+    
+    drawing = Drawing(width, height)
+    drawing.add(chart)
+    drawing.add(String(
+        chart.x, height - 0.2*inch, 'Match score by career',
+        fontName='Helvetica-Bold', fontSize=9, fillColor=colors.HexColor('#1f4788')
+    ))
+    
+    # Flatten into plain shapes so later renders skip axis and bar layout
+    _flatten_user_nodes(drawing)
+    return width, height, tuple(drawing.contents)
+
+
+def _flatten_user_nodes(group):
+    """Replace widgets and labels inside a group with the shapes they draw, in place"""
+    for index, child in enumerate(group.contents):
+        while isinstance(child, UserNode):
+            child = child.provideNode()
+        group.contents[index] = child
+        if isinstance(child, Group):
+            _flatten_user_nodes(child)
+
+
+def score_chart(recommendations):
+    """Chart drawing for the top recommendations, built around the cached shapes"""
+    entries = tuple(
+        (rec.career_path.title, int(rec.confidence_score * 100))
+        for rec in recommendations[:CHART_CAREERS]
+    )
+    width, height, shapes = build_score_chart(entries)
+    # Rendering sets the canvas on the drawing and a parent on every node it visits,
+    # so each report draws its own copy of the cached shape tree
+    return Drawing(width, height, *(_copy_shape(shape) for shape in shapes))
+
+
+def _copy_shape(node):
+    """Copy of a shape tree with its own nodes; attribute values such as points are shared"""
+    clone = copy(node)
+    if isinstance(node, Group):
+        clone.contents = [_copy_shape(child) for child in node.contents]
+    return clone
+
+
+def _new_document(output, invariant=False):
+    """Document template with the report's page size and margins"""
+    return SimpleDocTemplate(
+        output,
+        pagesize=letter,
+        rightMargin=0.5*inch,
+        leftMargin=0.5*inch,
+        topMargin=0.5*inch,
+        bottomMargin=0.5*inch,
+        title="Career Assessment Report",
+        invariant=invariant
+    )
+
+
+def _build(elements, output, invariant=False):
+    """Lay out elements into output, or a rewound BytesIO buffer when output is None"""
+    pdf_buffer = output if output is not None else BytesIO()
+    _new_document(pdf_buffer, invariant=invariant).build(elements)
+    if output is None:
+        pdf_buffer.seek(0)
+    return pdf_buffer
+
+
+def cover_elements(user, report, theme):
+    """Flowables for the cover page; the only part of the report that names the user or a date"""
+    styles = theme.styles
+    elements = []
+    
+    # ==================== COVER PAGE ====================
+    elements.append(Spacer(1, 1.5*inch))
+    
+    # Main title
+    elements.append(theme.flowable('cover_title'))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Subtitle
+    elements.append(theme.flowable('cover_subtitle'))
+    elements.append(Spacer(1, 0.8*inch))
+    
+    # Date everything by the report itself so a cached render stays accurate
+    report_date = report.created_at or datetime.now()
+    
+    # User info box
+    user_name = user.get_full_name() or user.username
+    user_email = user.email if user.email else "Not provided"
+    user_info_text = f"""
+    <b>Candidate:</b> {user_name}<br/>
+    <b>Email:</b> {user_email}<br/>
+    <b>Report Date:</b> {report_date.strftime('%B %d, %Y')}<br/>
+    <b>Report ID:</b> CR{report_date.strftime('%Y%m%d')}{user.id}
+    """
+    elements.append(Paragraph(user_info_text, styles['user_info']))
+    elements.append(Spacer(1, 0.5*inch))
+    
+    # Confidential notice
+    elements.append(theme.flowable('confidential'))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    footer_text = """
+    <i>This report was generated by CounselBot AI Career Assessment System.<br/>
+    Report generated on: {date}</i>
+    """.format(date=report_date.strftime('%Y-%m-%d %H:%M'))
+    elements.append(Paragraph(footer_text, styles['footer']))
+    
+    return elements
+
+
+def body_elements(report, recommendations, theme):
+    """
+    Flowables for every page after the cover
+    
+    Depends only on the recommendations and analysis, so users with the
+    same results get the same body
+    """
+    styles = theme.styles
+    normal_style = styles['normal']
+    elements = []
+    
+    # ==================== EXECUTIVE SUMMARY ====================
+    elements.append(theme.flowable('summary_heading'))
+    elements.append(theme.flowable('summary'))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Key findings box
+    total_recommendations = len(recommendations)
+    top_confidence = max([rec.confidence_score for rec in recommendations]) * 100 if recommendations else 0
+    
+    key_findings_text = f"""
+    <b>Key Findings:</b><br/>
+    • {total_recommendations} career paths identified as strong matches<br/>
+    • Top recommendation confidence: {top_confidence:.1f}%<br/>
+    • Assessment methodology: Skills + Interests + Personality analysis
+    """
+    elements.append(Paragraph(key_findings_text, styles['key_findings']))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # ==================== TOP RECOMMENDATIONS ====================
+    elements.append(theme.flowable('recommendations_heading'))
+    
+    if recommendations:
+        # Build professional recommendations table
+        rec_data = [['#', 'Career Path', 'Match Score', 'Key Strengths']]
+        
+        for idx, rec in enumerate(recommendations[:6], 1):
+            confidence = f"{int(rec.confidence_score * 100)}%"
+            career_title = rec.career_path.title
+            
+            # Generate dynamic description based on available data
+            description = generate_career_description(rec, idx)
+            
+            rec_data.append([
+                str(idx),
+                career_title,
+                confidence,
+                description
+            ])
+        
+        # Create table with optimized column widths
+        rec_table = Table(rec_data, colWidths=[0.4*inch, 1.8*inch, 0.8*inch, 3.0*inch])
+        rec_table.setStyle(theme.recommendations_table_style)
+        
+        elements.append(rec_table)
+        elements.append(Spacer(1, 0.3*inch))
+        elements.append(score_chart(recommendations))
+    else:
+        elements.append(theme.flowable('no_recommendations'))
+    
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # ==================== DETAILED ANALYSIS ====================
+    elements.append(PageBreak())
+    elements.append(theme.flowable('analysis_heading'))
+    
+    # Skills Analysis Section
+    elements.append(theme.flowable('skills_heading'))
+    skills_text = process_analysis_data(report.skill_analysis, "skills")
+    elements.append(Paragraph(skills_text, normal_style))
+    elements.append(Spacer(1, 0.15*inch))
+    
+    # Interests Analysis Section
+    elements.append(theme.flowable('interests_heading'))
+    interests_text = process_analysis_data(report.interest_analysis, "interests")
+    elements.append(Paragraph(interests_text, normal_style))
+    elements.append(Spacer(1, 0.15*inch))
+    
+    # Personality Insights Section
+    elements.append(theme.flowable('personality_heading'))
+    personality_text = process_analysis_data(report.personality_insights, "personality")
+    elements.append(Paragraph(personality_text, normal_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # ==================== NEXT STEPS ====================
+    elements.append(theme.flowable('next_steps_heading'))
+    elements.append(theme.flowable('next_steps'))
+    
+    # ==================== FOOTER ====================
+    elements.append(Spacer(1, 0.3*inch))
+    elements.append(theme.flowable('body_footer'))
+    
+    return elements
+
+
+def generate_pdf_report(user, report, recommendations, output=None, theme=None):
     """
     Generate a professional PDF report with optimized design
     
@@ -24,302 +497,53 @@ def generate_pdf_report(user, report, recommendations):
         user: Django User object
         report: AssessmentReport object
         recommendations: QuerySet of CareerRecommendation objects
+        output: Optional writable binary file object (temp file, storage file, response)
+                the PDF is written to directly; defaults to a new BytesIO buffer
+        theme: Optional ReportTheme, defaults to the module-level THEME
     
     Returns:
-        BytesIO buffer containing PDF data
+        The output object; a default BytesIO buffer is rewound for reading
     """
     try:
-        # Create PDF buffer
-        pdf_buffer = BytesIO()
-        
-        # Create PDF document with optimized margins
-        doc = SimpleDocTemplate(
-            pdf_buffer,
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch,
-            title="Career Assessment Report"
-        )
-        
-        # Container for PDF elements
-        elements = []
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        
-        # Custom professional styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#1f4788'),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#2E86AB'),
-            spaceAfter=8,
-            spaceBefore=16,
-            fontName='Helvetica-Bold',
-            borderPadding=5,
-            backColor=colors.HexColor('#F8F9FA')
-        )
-        
-        subheading_style = ParagraphStyle(
-            'CustomSubHeading',
-            parent=styles['Heading3'],
-            fontSize=12,
-            textColor=colors.HexColor('#1f4788'),
-            spaceAfter=6,
-            spaceBefore=12,
-            fontName='Helvetica-Bold'
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=6,
-            leading=12
-        )
-        
-        bold_style = ParagraphStyle(
-            'CustomBold',
-            parent=normal_style,
-            fontName='Helvetica-Bold',
-            textColor=colors.HexColor('#333333')
-        )
-        
-        # ==================== COVER PAGE ====================
-        elements.append(Spacer(1, 1.5*inch))
-        
-        # Main title
-        elements.append(Paragraph("CAREER ASSESSMENT REPORT", title_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Subtitle
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=normal_style,
-            fontSize=12,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#666666')
-        )
-        elements.append(Paragraph("Personalized Career Recommendations", subtitle_style))
-        elements.append(Spacer(1, 0.8*inch))
-        
-        # User info box
-        user_info_style = ParagraphStyle(
-            'UserInfo',
-            parent=normal_style,
-            alignment=TA_CENTER,
-            fontSize=11,
-            borderPadding=10,
-            backColor=colors.HexColor('#F0F8FF'),
-            borderColor=colors.HexColor('#1f4788'),
-            borderWidth=1
-        )
-        
-        user_name = user.get_full_name() or user.username
-        user_email = user.email if user.email else "Not provided"
-        user_info_text = f"""
-        <b>Candidate:</b> {user_name}<br/>
-        <b>Email:</b> {user_email}<br/>
-        <b>Report Date:</b> {datetime.now().strftime('%B %d, %Y')}<br/>
-        <b>Report ID:</b> CR{datetime.now().strftime('%Y%m%d')}{user.id}
-        """
-        elements.append(Paragraph(user_info_text, user_info_style))
-        elements.append(Spacer(1, 0.5*inch))
-        
-        # Confidential notice
-        confidential_style = ParagraphStyle(
-            'Confidential',
-            parent=normal_style,
-            alignment=TA_CENTER,
-            fontSize=8,
-            textColor=colors.HexColor('#999999')
-        )
-        elements.append(Paragraph("<i>Confidential Assessment Report - For Personal Use Only</i>", confidential_style))
-        
+        theme = theme or THEME
+        elements = cover_elements(user, report, theme)
         elements.append(PageBreak())
-        
-        # ==================== EXECUTIVE SUMMARY ====================
-        elements.append(Paragraph("Executive Summary", heading_style))
-        
-        summary_text = """
-        This comprehensive career assessment report provides personalized career recommendations 
-        based on your unique combination of skills, interests, personality traits, and professional 
-        preferences. The analysis utilizes advanced machine learning algorithms to match your profile 
-        with suitable career paths in today's dynamic job market.
-        """
-        elements.append(Paragraph(summary_text, normal_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Key findings box
-        key_findings_style = ParagraphStyle(
-            'KeyFindings',
-            parent=normal_style,
-            backColor=colors.HexColor('#FFF8E1'),
-            borderColor=colors.HexColor('#FFC107'),
-            borderWidth=1,
-            borderPadding=10,
-            leftIndent=10,
-            rightIndent=10
-        )
-        
-        total_recommendations = len(recommendations)
-        top_confidence = max([rec.confidence_score for rec in recommendations]) * 100 if recommendations else 0
-        
-        key_findings_text = f"""
-        <b>Key Findings:</b><br/>
-        • {total_recommendations} career paths identified as strong matches<br/>
-        • Top recommendation confidence: {top_confidence:.1f}%<br/>
-        • Analysis completed: {datetime.now().strftime('%B %d, %Y')}<br/>
-        • Assessment methodology: Skills + Interests + Personality analysis
-        """
-        elements.append(Paragraph(key_findings_text, key_findings_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # ==================== TOP RECOMMENDATIONS ====================
-        elements.append(Paragraph("Top Career Recommendations", heading_style))
-        
-        if recommendations:
-            # Build professional recommendations table
-            rec_data = [
-                ['#', 'Career Path', 'Match Score', 'Key Strengths'],
-                ['1', '', '', '']
-            ]
-            
-            # Clear the placeholder row
-            rec_data = [['#', 'Career Path', 'Match Score', 'Key Strengths']]
-            
-            for idx, rec in enumerate(recommendations[:6], 1):
-                confidence = f"{int(rec.confidence_score * 100)}%"
-                career_title = rec.career_path.title
-                
-                # Generate dynamic description based on available data
-                description = generate_career_description(rec, idx)
-                
-                rec_data.append([
-                    str(idx),
-                    career_title,
-                    confidence,
-                    description
-                ])
-            
-            # Create table with optimized column widths
-            rec_table = Table(rec_data, colWidths=[0.4*inch, 1.8*inch, 0.8*inch, 3.0*inch])
-            
-            # Professional table styling
-            rec_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f4788')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-                
-                # Data rows
-                ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Rank column
-                ('ALIGN', (2, 1), (2, -1), 'CENTER'),  # Score column
-                ('ALIGN', (1, 1), (1, -1), 'LEFT'),    # Career column
-                ('ALIGN', (3, 1), (3, -1), 'LEFT'),    # Description column
-                
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                
-                # Alternating row colors
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-                 [colors.white, colors.HexColor('#f8f9fa')]),
-                
-                # Grid lines
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#dddddd')),
-                ('LINEBELOW', (0, 0), (-1, 0), 1, colors.HexColor('#1f4788')),
-                
-                # Padding
-                ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                ('TOPPADDING', (0, 0), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-            ]))
-            
-            elements.append(rec_table)
-        else:
-            elements.append(Paragraph("No career recommendations available.", normal_style))
-        
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # ==================== DETAILED ANALYSIS ====================
-        elements.append(PageBreak())
-        elements.append(Paragraph("Detailed Analysis", heading_style))
-        
-        # Skills Analysis Section
-        elements.append(Paragraph("Skills Assessment", subheading_style))
-        skills_text = process_analysis_data(report.skill_analysis, "skills")
-        elements.append(Paragraph(skills_text, normal_style))
-        elements.append(Spacer(1, 0.15*inch))
-        
-        # Interests Analysis Section
-        elements.append(Paragraph("Interests Profile", subheading_style))
-        interests_text = process_analysis_data(report.interest_analysis, "interests")
-        elements.append(Paragraph(interests_text, normal_style))
-        elements.append(Spacer(1, 0.15*inch))
-        
-        # Personality Insights Section
-        elements.append(Paragraph("Personality Insights", subheading_style))
-        personality_text = process_analysis_data(report.personality_insights, "personality")
-        elements.append(Paragraph(personality_text, normal_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # ==================== NEXT STEPS ====================
-        elements.append(Paragraph("Recommended Next Steps", subheading_style))
-        
-        next_steps_text = """
-        <b>1. Research Top Careers:</b> Explore the recommended career paths in detail<br/>
-        <b>2. Skill Development:</b> Identify key skills to develop for your top matches<br/>
-        <b>3. Networking:</b> Connect with professionals in your target industries<br/>
-        <b>4. Education Planning:</b> Research required education and certifications<br/>
-        <b>5. Career Counseling:</b> Schedule a session with a career advisor<br/>
-        """
-        elements.append(Paragraph(next_steps_text, normal_style))
-        
-        # ==================== FOOTER ====================
-        elements.append(Spacer(1, 0.3*inch))
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=normal_style,
-            fontSize=8,
-            textColor=colors.HexColor('#666666'),
-            alignment=TA_CENTER
-        )
-        
-        footer_text = """
-        <i>This report was generated by CounselBot AI Career Assessment System.<br/>
-        For personalized career counseling or additional support, please contact our career advisors.<br/>
-        Report generated on: {date}</i>
-        """.format(date=datetime.now().strftime('%Y-%m-%d %H:%M'))
-        
-        elements.append(Paragraph(footer_text, footer_style))
-        
-        # Build PDF
-        doc.build(elements)
-        pdf_buffer.seek(0)
-        return pdf_buffer
+        elements.extend(body_elements(report, recommendations, theme))
+        return _build(elements, output)
         
     except Exception as e:
         logger.error(f"PDF generation error: {str(e)}")
         raise Exception(f"Error generating PDF report: {str(e)}")
 
+
+def generate_pdf_cover(user, report, output=None, theme=None):
+    """Render only the per-user cover page; see generate_pdf_report for the arguments"""
+    try:
+        return _build(cover_elements(user, report, theme or THEME), output)
+    except Exception as e:
+        logger.error(f"PDF cover generation error: {str(e)}")
+        raise Exception(f"Error generating PDF cover: {str(e)}")
+
+
+def generate_pdf_body(report, recommendations, output=None, theme=None):
+    """
+    Render every page after the cover
+    
+    The output is byte-for-byte reproducible for the same inputs, so bodies can
+    be stored by content hash and shared between users
+    """
+    try:
+        return _build(body_elements(report, recommendations, theme or THEME), output, invariant=True)
+    except Exception as e:
+        logger.error(f"PDF body generation error: {str(e)}")
+        raise Exception(f"Error generating PDF body: {str(e)}")
+
+
+def count_pdf_pages(data):
+    """Count the page objects in rendered PDF bytes"""
+    return len(re.findall(rb'/Type\s*/Page\b', data))
+
+
 def generate_career_description(recommendation, rank):
     """
     Generate dynamic, unique descriptions for each career recommendation
@@ -357,7 +581,8 @@ def generate_career_description(recommendation, rank):
             break
     
     # Select strengths based on industry and rank
-    strength_idx = (rank + hash(recommendation.career_path.title)) % len(base_strengths)
+    # crc32 rather than hash() so the choice is stable across processes
+    strength_idx = (rank + zlib.crc32(recommendation.career_path.title.encode('utf-8'))) % len(base_strengths)
     strength = base_strengths[strength_idx]
     
     descriptions = {
@@ -0,0 +1,91 @@
+"""
+Recommendation Result Cache
+Content-addressed memoization of scored recommendations, shared across users
+who submit the same answers against the same career catalog
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+
+from .cache import TieredCache, bump_generation, get_generation
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever calculate_career_score or generate_recommendation_reasoning changes
+SCORING_VERSION = 1
+
+# Keys are content addresses, so local entries never go stale
+_cache = TieredCache(
+    'recommendations',
+    version=SCORING_VERSION,
+    alias=settings.RECOMMENDATION_CACHE_ALIAS,
+    timeout=settings.RECOMMENDATION_CACHE_TIMEOUT,
+    local_size=settings.RECOMMENDATION_CACHE_SIZE,
+)
+
+
+def catalog_fingerprint(career_paths):
+    """Hash of every career path field that feeds scoring or reasoning"""
+    catalog = [
+        [cp.id, cp.title, cp.required_skills, cp.education_requirements, cp.average_salary]
+        for cp in sorted(career_paths, key=lambda cp: cp.id)
+    ]
+    return hashlib.sha256(json.dumps(catalog, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def recommendation_cache_key(user_responses, career_paths):
+    """
+    Build the content address for a scoring run
+
+    Args:
+        user_responses: UserResponse or SubmittedAnswer objects with their questions loaded
+        career_paths: CareerPath objects being scored
+
+    Returns:
+        Cache key string
+    """
+    # Scoring and reasoning only look at the lowercased text and the question type
+    answers = sorted(
+        (response.question.id, response.question.question_type, response.response_text.lower())
+        for response in user_responses
+    )
+    payload = json.dumps({
+        'answers': answers,
+        'catalog': catalog_fingerprint(career_paths),
+    }, sort_keys=True)
+    return _cache.key(hashlib.sha256(payload.encode('utf-8')).hexdigest())
+
+
+def get_cached_recommendations(key, career_paths):
+    """
+    Look up a previous scoring run
+
+    Returns:
+        List of (career_path, score, reasoning) tuples, or None on a miss
+    """
+    entries = _cache.get(key)
+    if entries is None:
+        return None
+
+    paths_by_id = {cp.id: cp for cp in career_paths}
+    if any(career_id not in paths_by_id for career_id, _, _ in entries):
+        return None
+    return [(paths_by_id[career_id], score, reasoning) for career_id, score, reasoning in entries]
+
+
+def cache_recommendations(key, results):
+    """Store a scoring run under its content address in every cache tier"""
+    _cache.set(key, [(career_path.id, score, reasoning) for career_path, score, reasoning in results])
+
+
+def recommendation_version(user_id):
+    """Changes whenever the user's stored recommendations do; for keying rendered fragments"""
+    return get_generation(f"recommendations:{user_id}")
+
+
+def bump_recommendation_version(user_id):
+    """Orphan every fragment rendered from the user's previous recommendations"""
+    bump_generation(f"recommendations:{user_id}")
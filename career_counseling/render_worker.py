@@ -0,0 +1,34 @@
+"""
+Report Render Worker
+Entry points for PDF render processes, kept free of module-level Django imports
+so spawned workers can unpickle them before django.setup() has run
+"""
+
+
+def init_worker():
+    import django
+    django.setup()
+
+
+def render_report(report_id):
+    """Render and store the PDF for one report"""
+    from django.db import close_old_connections
+    from .reports import render_stored_report
+
+    try:
+        render_stored_report(report_id)
+    finally:
+        close_old_connections()
+
+
+def render_pdf(user, report, recommendations):
+    """
+    Render one report to bytes in a pool process
+
+    Returns:
+        (pdf_bytes, page_count) tuple
+    """
+    from .pdf_generator import count_pdf_pages, generate_pdf_report
+
+    data = generate_pdf_report(user, report, recommendations).getvalue()
+    return data, count_pdf_pages(data)
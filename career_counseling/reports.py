@@ -0,0 +1,344 @@
+"""
+Report File Cache
+Renders each assessment PDF once per report version, pre-rendering in a background process
+pool right after an assessment completes. Report bodies are stored once per content hash and
+shared between users with the same results; AssessmentReport.report_file only holds the
+per-user cover, and the two are joined when the report is downloaded
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from . import render_worker
+from .cache import acquire_lock, is_locked, release_lock
+from .db_router import use_primary
+from .metrics import observe_pdf_render, set_render_queue_depth
+from .slow_queries import capture_slow_queries
+from .models import AssessmentReport, CareerRecommendation
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever pdf_generator output changes so stored files are re-rendered
+PDF_RENDERER_VERSION = 3
+
+
+def report_content_hash(user, report, recommendations):
+    """Hash of everything that appears in the rendered PDF"""
+    payload = {
+        'renderer': PDF_RENDERER_VERSION,
+        'report': [report.id, report.created_at.isoformat() if report.created_at else None],
+        'user': [user.id, user.username, user.get_full_name(), user.email],
+        'analysis': [report.skill_analysis, report.interest_analysis, report.personality_insights],
+        'recommendations': [
+            [rec.career_path.title, rec.confidence_score, rec.reasoning]
+            for rec in recommendations
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def body_content_hash(report, recommendations):
+    """Hash of everything that appears after the cover page"""
+    payload = {
+        'renderer': PDF_RENDERER_VERSION,
+        'analysis': [report.skill_analysis, report.interest_analysis, report.personality_insights],
+        'recommendations': [
+            [rec.career_path.title, rec.confidence_score, rec.reasoning]
+            for rec in recommendations
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _body_name(body_hash):
+    return f"reports/bodies/{body_hash[:2]}/{body_hash}.pdf"
+
+
+def store_report_body(report, recommendations):
+    """
+    Make sure the shared body for these results is in storage, rendering it on a miss
+
+    Returns:
+        Storage name of the body PDF
+    """
+    from .pdf_generator import generate_pdf_body
+
+    name = _body_name(body_content_hash(report, recommendations))
+    if default_storage.exists(name):
+        return name
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.REPORT_SPOOL_MAX_MEMORY) as spool:
+        generate_pdf_body(report, recommendations, output=spool)
+        spool.seek(0)
+        saved = default_storage.save(name, File(spool))
+
+    # Another process stored the same body first; keep theirs
+    if saved != name:
+        default_storage.delete(saved)
+    logger.info(f"Stored shared report body {name}")
+    return name
+
+
+def release_report_body(body_hash):
+    """Delete a shared body once no report refers to it any more"""
+    if not body_hash:
+        return
+    # The reference check must see the latest writes, not a lagging replica
+    with use_primary():
+        if AssessmentReport.objects.filter(body_hash=body_hash).exists():
+            return
+    default_storage.delete(_body_name(body_hash))
+    logger.info(f"Deleted unreferenced report body {body_hash[:16]}")
+
+
+def write_report_pdf(user, report, recommendations, output):
+    """
+    Write the file kept on report_file into output
+
+    Returns:
+        Content hash of the shared body the file is a cover for, or an empty string
+        when pypdf is not installed and output holds the complete report instead
+    """
+    from .pdf_generator import generate_pdf_cover, generate_pdf_report
+
+    try:
+        import pypdf  # noqa: F401  needed to join the pieces on download
+    except ImportError:
+        generate_pdf_report(user, report, recommendations, output=output)
+        return ''
+
+    store_report_body(report, recommendations)
+    generate_pdf_cover(user, report, output=output)
+    return body_content_hash(report, recommendations)
+
+
+def open_report_pdf(report):
+    """
+    Open the complete PDF for a report whose file is current
+
+    Returns:
+        Binary file object positioned at the start; the caller closes it
+    """
+    if not report.body_hash:
+        return report.report_file.open('rb')
+
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.REPORT_SPOOL_MAX_MEMORY)
+    try:
+        with report.report_file.open('rb') as cover, default_storage.open(_body_name(report.body_hash), 'rb') as body:
+            writer.append(cover)
+            writer.append(body)
+            writer.write(spool)
+    except Exception:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def _render_lock_key(report_id):
+    return f"report-render:{report_id}"
+
+
+def _is_current(report, content_hash):
+    return (
+        report.report_hash == content_hash
+        and bool(report.report_file)
+        and report.report_file.storage.exists(report.report_file.name)
+        and (not report.body_hash or default_storage.exists(_body_name(report.body_hash)))
+    )
+
+
+def get_report_pdf(user, report, recommendations):
+    """
+    Make sure report.report_file and its shared body hold the PDF for the current
+    report contents, waiting for an in-flight background render instead of starting a duplicate
+
+    Args:
+        user: Django User object
+        report: AssessmentReport object
+        recommendations: CareerRecommendation objects with career_path loaded
+
+    Returns:
+        Content hash of the stored PDF, usable as an ETag
+    """
+    content_hash = report_content_hash(user, report, recommendations)
+    if _is_current(report, content_hash):
+        return content_hash
+
+    if _wait_for_inflight_render(report) and _is_current(report, content_hash):
+        return content_hash
+
+    lock_key = _render_lock_key(report.id)
+    token = _acquire_render_lock(lock_key, report)
+    try:
+        # The previous holder may have just stored this version, and its file name is the one to replace
+        report.refresh_from_db(fields=['report_file', 'report_hash', 'body_hash'])
+        if _is_current(report, content_hash):
+            return content_hash
+
+        # Render into a spooled temp file so large reports spill to disk instead of
+        # being held twice in memory, then let storage copy it in chunks
+        with tempfile.SpooledTemporaryFile(max_size=settings.REPORT_SPOOL_MAX_MEMORY) as spool:
+            started = time.perf_counter()
+            body_hash = write_report_pdf(user, report, recommendations, spool)
+            observe_pdf_render(time.perf_counter() - started, spool.tell())
+            spool.seek(0)
+
+            if report.report_file:
+                report.report_file.delete(save=False)
+            report.report_file.save(f"report-{report.id}-{content_hash[:16]}.pdf", File(spool), save=False)
+        previous_body, report.body_hash = report.body_hash, body_hash
+        report.report_hash = content_hash
+        report.save(update_fields=['report_file', 'report_hash', 'body_hash'])
+        if previous_body and previous_body != body_hash:
+            transaction.on_commit(lambda: release_report_body(previous_body))
+    finally:
+        release_lock(lock_key, token)
+
+    logger.info(f"Rendered and stored PDF for report {report.id}")
+    return content_hash
+
+
+def _acquire_render_lock(lock_key, report):
+    """
+    Wait until this caller holds the render lock for a report
+
+    The lock expires after REPORT_RENDER_WAIT_SECONDS, so a holder that died only
+    delays the next render. Raises TimeoutError if other renders keep it for longer
+    than twice that.
+
+    Returns:
+        Token to release the lock with
+    """
+    timeout = settings.REPORT_RENDER_WAIT_SECONDS
+    deadline = time.monotonic() + 2 * timeout
+    while True:
+        token = acquire_lock(lock_key, timeout)
+        if token is not None:
+            return token
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Report {report.id} is still being rendered elsewhere")
+        time.sleep(0.2)
+
+
+# Background pre-rendering; futures are keyed by report id so downloads can join them
+_render_pool = None
+_inflight = {}
+_pool_lock = threading.Lock()
+
+
+def render_stored_report(report_id):
+    """Render and store the PDF for a report by id; used by the background workers"""
+    # Scheduled right after the report is committed, before a replica may have it
+    with use_primary(), capture_slow_queries(f"report render {report_id}"):
+        report = AssessmentReport.objects.select_related('user').filter(pk=report_id).first()
+        if report is None:
+            return
+        recommendations = list(
+            CareerRecommendation.objects.filter(user=report.user)
+            .select_related('career_path')
+            .order_by('-confidence_score')
+        )
+        if recommendations:
+            get_report_pdf(report.user, report, recommendations)
+
+
+def _get_render_pool():
+    global _render_pool
+    if settings.REPORT_RENDER_PROCESSES <= 0:
+        return None
+    if _render_pool is None:
+        # Spawned rather than forked: the parent runs worker threads and holds DB connections
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.REPORT_RENDER_PROCESSES,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=render_worker.init_worker
+        )
+    return _render_pool
+
+
+def schedule_report_render(report):
+    """
+    Queue a background PDF render for a freshly generated report
+
+    Returns:
+        Future for the render, or None when pre-rendering is disabled or the queue is full
+    """
+    with _pool_lock:
+        future = _inflight.get(report.pk)
+        if future is not None and not future.done():
+            return future
+        if len(_inflight) >= settings.REPORT_RENDER_QUEUE_LIMIT:
+            logger.warning(f"Report render queue full, report {report.pk} will render on download")
+            return None
+
+        pool = _get_render_pool()
+        if pool is None:
+            return None
+        future = pool.submit(render_worker.render_report, report.pk)
+        _inflight[report.pk] = future
+        set_render_queue_depth(len(_inflight))
+
+    def _forget(done, report_id=report.pk):
+        with _pool_lock:
+            if _inflight.get(report_id) is done:
+                del _inflight[report_id]
+            set_render_queue_depth(len(_inflight))
+        if done.exception() is not None:
+            logger.error(f"Background render of report {report_id} failed: {done.exception()}")
+
+    future.add_done_callback(_forget)
+    return future
+
+
+def _wait_for_inflight_render(report):
+    """
+    Block until a background or concurrent render of this report finishes
+
+    Returns:
+        True if a render was waited on and the report was refreshed
+    """
+    timeout = settings.REPORT_RENDER_WAIT_SECONDS
+    with _pool_lock:
+        future = _inflight.get(report.pk)
+
+    if future is not None:
+        try:
+            future.result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Waiting on background render of report {report.pk} failed: {str(e)}")
+    elif is_locked(_render_lock_key(report.pk)):
+        deadline = time.monotonic() + timeout
+        while is_locked(_render_lock_key(report.pk)) and time.monotonic() < deadline:
+            time.sleep(0.2)
+    else:
+        return False
+
+    report.refresh_from_db(fields=['report_file', 'report_hash', 'body_hash'])
+    return True
+
+
+def invalidate_report_file(report):
+    """Drop a stored PDF so the next download renders a fresh one"""
+    if not report.report_file and not report.report_hash:
+        return
+    if report.report_file:
+        report.report_file.delete(save=False)
+    body_hash = report.body_hash
+    report.report_hash = report.body_hash = ''
+    AssessmentReport.objects.filter(pk=report.pk).update(report_file='', report_hash='', body_hash='')
+    transaction.on_commit(lambda: release_report_body(body_hash))
@@ -77,7 +77,7 @@ class AssessmentReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = AssessmentReport
         fields = '__all__'
-        read_only_fields = ('report_file',)
+        read_only_fields = ('report_file', 'report_hash', 'body_hash')
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
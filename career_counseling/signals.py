@@ -1,7 +1,11 @@
-﻿from django.db.models.signals import post_save
+﻿from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import UserProfile
+from django.db import transaction
+from .models import UserProfile, AssessmentReport, CareerPath, CareerRecommendation, Question
+from .reports import invalidate_report_file, release_report_body
+from .catalog import invalidate_catalog
+from .recommendation_cache import bump_recommendation_version
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -18,6 +22,50 @@ def save_user_profile(sender, instance, **kwargs):
     This prevents RelatedObjectDoesNotExist errors during Google OAuth login.
     """
     user_profile, created = UserProfile.objects.get_or_create(user=instance)
-    # Only save if it already existed (not newly created)
+    # Only save if it already existed (not newly created); saving refreshes profile_completion
     if not created:
+        user_profile.user = instance
         user_profile.save()
+
+
+@receiver(post_save, sender=AssessmentReport)
+def invalidate_saved_report(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached PDF when the report itself is edited."""
+    if update_fields and set(update_fields) <= {'report_file', 'report_hash', 'body_hash'}:
+        return
+    invalidate_report_file(instance)
+
+
+@receiver(post_delete, sender=AssessmentReport)
+def delete_report_file(sender, instance, **kwargs):
+    """Remove the cached cover from storage along with its report, and its body once unreferenced."""
+    if instance.report_file:
+        instance.report_file.delete(save=False)
+    if instance.body_hash:
+        transaction.on_commit(lambda: release_report_body(instance.body_hash))
+
+
+@receiver(post_save, sender=CareerRecommendation)
+def invalidate_recommendation_reports(sender, instance, **kwargs):
+    """Drop cached PDFs that list a recommendation which has just changed."""
+    for report in AssessmentReport.objects.filter(user_id=instance.user_id).exclude(report_hash=''):
+        invalidate_report_file(report)
+
+
+@receiver(post_save, sender=CareerRecommendation)
+def bump_recommendation_pages(sender, instance, created=False, **kwargs):
+    """Retire the user's cached recommendation pages when one of their recommendations is edited."""
+    bump_recommendation_version(instance.user_id)
+    if created:
+        UserProfile.objects.filter(user_id=instance.user_id).update(
+            recommendation_count=CareerRecommendation.objects.filter(user_id=instance.user_id).count()
+        )
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+@receiver(post_save, sender=CareerPath)
+@receiver(post_delete, sender=CareerPath)
+def invalidate_cached_catalog(sender, **kwargs):
+    """Drop the cached question and career catalog when either is edited."""
+    invalidate_catalog()
@@ -0,0 +1,160 @@
+"""
+Slow Query Capture
+Records career_counseling queries slower than SLOW_QUERY_MS with a stack summary and
+their EXPLAIN plan, keeping only the newest SLOW_QUERY_LIMIT in the SlowQuery table
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Frames from these modules are capture machinery or middleware, not the code that ran the query
+IGNORED_FILES = tuple(
+    os.path.join(APP_DIR, name) for name in ('slow_queries.py', 'instrumentation.py', 'db_router.py')
+)
+
+# Only the outermost capture on a thread records; nested ones (a job run inside a request) pass through
+_state = threading.local()
+
+
+class _Capture:
+    """execute_wrapper that keeps the slow queries issued from career_counseling code"""
+
+    def __init__(self, source):
+        self.source = source
+        self.threshold = settings.SLOW_QUERY_MS / 1000
+        self.pending = deque(maxlen=settings.SLOW_QUERY_BUFFER_SIZE)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.threshold:
+                stack = app_stack()
+                if stack:
+                    self.pending.append((context['connection'].alias, sql, params, many, elapsed, stack))
+
+
+def app_stack():
+    """Innermost career_counseling frames of the current stack, formatted one per line"""
+    frames = []
+    for frame in traceback.extract_stack():
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(APP_DIR + os.sep) and filename not in IGNORED_FILES:
+            frames.append(f"{os.path.relpath(filename, APP_DIR)}:{frame.lineno} in {frame.name}")
+    return frames[-settings.SLOW_QUERY_STACK_DEPTH:]
+
+
+def params_hash(params):
+    """Groups executions of the same statement with the same parameters without storing them"""
+    return hashlib.sha256(repr(params).encode('utf-8')).hexdigest()[:16]
+
+
+def explain(alias, sql, params):
+    """
+    Plan for a SELECT on the database it ran against
+
+    Returns:
+        Plan text, or an empty string for statements that are not explained
+    """
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return ''
+    connection = connections[alias]
+    prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    try:
+        # A savepoint keeps a failed EXPLAIN from breaking an enclosing PostgreSQL transaction
+        with transaction.atomic(using=alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    except DatabaseError as e:
+        return f"EXPLAIN failed: {e}"
+    # SQLite puts the plan text in the last column, PostgreSQL returns a single column
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def _store(capture):
+    from .models import SlowQuery
+
+    SlowQuery.objects.bulk_create([
+        SlowQuery(
+            database=alias,
+            source=str(capture.source)[:200],
+            duration_ms=elapsed * 1000,
+            sql=sql,
+            params_hash=params_hash(params),
+            stack='\n'.join(stack),
+            plan='' if many else explain(alias, sql, params),
+        )
+        for alias, sql, params, many, elapsed, stack in capture.pending
+    ])
+    trim_slow_queries(settings.SLOW_QUERY_LIMIT)
+    logger.warning("Captured %d slow queries from %s", len(capture.pending), capture.source)
+
+
+def trim_slow_queries(limit):
+    """Delete all but the newest `limit` captured queries"""
+    from .models import SlowQuery
+
+    cutoff = SlowQuery.objects.order_by('-id').values_list('id', flat=True)[limit:limit + 1].first()
+    if cutoff is not None:
+        SlowQuery.objects.filter(id__lte=cutoff).delete()
+
+
+@contextmanager
+def capture_slow_queries(source):
+    """
+    Record slow queries run on this thread inside the block
+
+    Captures are buffered in memory while the block runs and written, with their
+    EXPLAIN plans, once it exits, so explaining never happens mid-request.
+
+    Args:
+        source: Label stored with each query; may be changed on the yielded capture,
+                e.g. once the request's route is known
+    """
+    if not settings.SLOW_QUERY_CAPTURE or getattr(_state, 'active', False):
+        yield None
+        return
+
+    capture = _Capture(source)
+    _state.active = True
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(capture))
+            yield capture
+    finally:
+        _state.active = False
+        if capture.pending:
+            try:
+                _store(capture)
+            except DatabaseError as e:
+                logger.error("Could not store slow queries from %s: %s", capture.source, e)
+
+
+class SlowQueryMiddleware:
+    """Capture slow queries for each request, labelled with the request's route name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_slow_queries(request.path) as capture:
+            response = self.get_response(request)
+            if capture is not None and request.resolver_match is not None:
+                capture.source = request.resolver_match.view_name
+        return response
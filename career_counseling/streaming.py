@@ -0,0 +1,171 @@
+"""
+Recommendation Streaming
+ASGI endpoint that streams career scores to the browser as Server-Sent Events
+while a recommendation job runs
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from http.cookies import SimpleCookie
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+
+from .db_router import use_primary
+from .jobs import run_job
+from .models import CareerRecommendation, RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+STREAM_PATH = re.compile(r'^/assessment/stream/(?P<job_id>[0-9a-f-]{36})/$')
+KEEPALIVE_SECONDS = 15
+REPLAY_TIMEOUT_SECONDS = 60
+
+
+def stream_url(job):
+    """URL of the event stream for a recommendation job"""
+    return f"/assessment/stream/{job.pk}/"
+
+
+def route_streams(django_application):
+    """Wrap the Django ASGI application so stream URLs bypass the sync request cycle"""
+    async def application(scope, receive, send):
+        if scope['type'] == 'http':
+            match = STREAM_PATH.match(scope['path'])
+            if match:
+                return await stream_recommendations(scope, send, match.group('job_id'))
+        return await django_application(scope, receive, send)
+    return application
+
+
+def _load_job(scope, job_id):
+    """Authenticate the request from its session cookie and fetch the user's job"""
+    try:
+        cookies = SimpleCookie()
+        for name, value in scope.get('headers', []):
+            if name == b'cookie':
+                cookies.load(value.decode('latin-1'))
+        morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+        session = import_module(settings.SESSION_ENGINE).SessionStore(morsel.value if morsel else None)
+
+        user = get_user(SimpleNamespace(session=session))
+        if not user.is_authenticated:
+            return None, None
+        return user, RecommendationJob.objects.filter(pk=job_id, user=user).first()
+    finally:
+        close_old_connections()
+
+
+def _format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode('utf-8')
+
+
+def _score_payload(career_path, score, reasoning):
+    return {
+        'career_id': career_path.id,
+        'title': career_path.title,
+        'score': score,
+        'reasoning': reasoning,
+    }
+
+
+def _replay_finished_job(job_id, on_result):
+    """Wait for a job claimed by another worker, then emit its persisted results"""
+    deadline = time.monotonic() + REPLAY_TIMEOUT_SECONDS
+    job = RecommendationJob.objects.get(pk=job_id)
+    while job.status in ('PENDING', 'RUNNING') and time.monotonic() < deadline:
+        time.sleep(0.5)
+        job.refresh_from_db(fields=['status'])
+
+    if job.status == 'DONE':
+        # Just written by the other worker, which a lagging replica may not have yet
+        with use_primary():
+            recommendations = list(
+                CareerRecommendation.objects.filter(user_id=job.user_id).select_related('career_path')
+            )
+        for rec in recommendations:
+            on_result(rec.career_path, rec.confidence_score, rec.reasoning)
+    return job.status
+
+
+async def _send_response(send, status, body):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode('utf-8')})
+
+
+async def stream_recommendations(scope, send, job_id):
+    """
+    Run a queued recommendation job and stream each career score as an SSE event
+
+    Events:
+        score: one per career path as soon as it is scored
+        done:  all recommendations are persisted; carries the redirect URL
+        error: the job failed or could not be found
+    """
+    user, job = await sync_to_async(_load_job, thread_sensitive=False)(scope, job_id)
+    if user is None:
+        return await _send_response(send, 403, {'status': 'error', 'message': 'Authentication required'})
+    if job is None:
+        return await _send_response(send, 404, {'status': 'error', 'message': 'Assessment job not found'})
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def on_result(career_path, score, reasoning):
+        loop.call_soon_threadsafe(events.put_nowait, ('score', _score_payload(career_path, score, reasoning)))
+
+    def produce():
+        # Scoring runs on a worker thread; results cross back to the event loop through the queue
+        try:
+            if run_job(job.pk, on_result=on_result):
+                status = RecommendationJob.objects.values_list('status', flat=True).get(pk=job.pk)
+            else:
+                status = _replay_finished_job(job.pk, on_result)
+        except Exception as e:
+            logger.error(f"Recommendation stream error: {str(e)}")
+            status = 'FAILED'
+        finally:
+            close_old_connections()
+
+        if status == 'DONE':
+            final = ('done', {'status': 'success', 'redirect_url': '/recommendations/'})
+        else:
+            final = ('error', {'status': 'error', 'message': 'Error processing assessment'})
+        loop.call_soon_threadsafe(events.put_nowait, final)
+
+    producer = asyncio.ensure_future(sync_to_async(produce, thread_sensitive=False)())
+
+    while True:
+        try:
+            event, data = await asyncio.wait_for(events.get(), timeout=KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+            continue
+
+        await send({'type': 'http.response.body', 'body': _format_event(event, data), 'more_body': True})
+        if event in ('done', 'error'):
+            break
+
+    await producer
+    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
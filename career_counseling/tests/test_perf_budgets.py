@@ -0,0 +1,263 @@
+"""
+View Performance Budgets
+Seeds a catalog and a user history at a small and a large data volume in the test database,
+and checks the main pages and API endpoints run the same, fixed number of queries at both.
+
+Latencies are only checked on request: PERF_SAVE_BASELINE=path writes the median warm latency
+of every view to a JSON baseline, and PERF_BASELINE=path fails views that got slower than it by
+more than PERF_TOLERANCE (0.5 by default).
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from collections import namedtuple
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from career_counseling.cache import clear_local_caches
+from career_counseling.models import AssessmentSubmission, CareerPath, CareerRecommendation, Question, UserResponse
+
+# name -> (questions, career paths, past submissions)
+DATA_VOLUMES = {
+    'small': (5, 3, 1),
+    'large': (60, 40, 40),
+}
+
+QUESTION_TYPES = ('SKILLS', 'INTERESTS', 'PERSONALITY')
+OPTIONS = ['Excellent', 'Good', 'Fair', 'Poor']
+
+# Median latency changes smaller than this are noise on any machine
+MIN_REGRESSION_MS = 5
+
+# Nothing seeded here may reach a cache other processes read
+TEST_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'perf-budgets'}}
+
+Fixture = namedtuple('Fixture', ['user', 'questions', 'career_paths'])
+
+# request(fixture, iteration) returns extra Client arguments; iteration varies the answers
+# so repeated submissions keep changing something
+ViewBudget = namedtuple('ViewBudget', ['name', 'method', 'url_name', 'queries', 'status', 'request'])
+
+
+def _answers(fixture, iteration):
+    return [(question, OPTIONS[(i + iteration) % len(OPTIONS)]) for i, question in enumerate(fixture.questions)]
+
+
+def _ajax_submission(fixture, iteration):
+    responses = {question.question_text: answer for question, answer in _answers(fixture, iteration)}
+    return {
+        'data': json.dumps({'responses': responses}),
+        'content_type': 'application/json',
+        'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest',
+    }
+
+
+def _form_submission(fixture, iteration):
+    return {'data': {f'question_{question.id}': answer for question, answer in _answers(fixture, iteration)}}
+
+
+VIEW_BUDGETS = [
+    ViewBudget('assessment', 'get', 'assessment', 3, 200, None),
+    ViewBudget('assessment_submit', 'post', 'assessment', 11, 202, _ajax_submission),
+    ViewBudget('assessment_form', 'post', 'assessment', 25, 302, _form_submission),
+    ViewBudget('recommendations', 'get', 'recommendations', 3, 200, None),
+    ViewBudget('profile', 'get', 'profile', 5, 200, None),
+    ViewBudget('download_report', 'get', 'download_report', 6, 200, None),
+    ViewBudget('api_questions', 'get', 'question-list', 3, 200, None),
+    ViewBudget('api_responses', 'get', 'userresponse-list', 3, 200, None),
+    ViewBudget('api_recommendations', 'post', 'career-recommendations', 15, 200, None),
+]
+
+
+def seed_fixture(volume):
+    """Catalog, user, answers, submission history, recommendations and report at one data volume"""
+    from career_counseling.frontend_views import generate_recommendations
+
+    question_count, career_count, submissions = DATA_VOLUMES[volume]
+    prefix = f'perf-budget-{volume}'
+    questions = [
+        Question.objects.create(
+            question_text=f'{prefix} question {i}: how would you rate yourself?',
+            question_type=QUESTION_TYPES[i % len(QUESTION_TYPES)],
+            options=OPTIONS,
+        )
+        for i in range(question_count)
+    ]
+    career_paths = [
+        CareerPath.objects.create(
+            title=f'{prefix} career {i}',
+            description='Seeded for performance budget checks',
+            required_skills={'skills': ['analysis', 'communication']},
+            education_requirements={'degree': 'Bachelor'},
+            average_salary='$60,000 - $90,000',
+            job_outlook='Stable',
+        )
+        for i in range(career_count)
+    ]
+
+    user = User.objects.create(username=prefix, first_name='Perf', last_name='Budget')
+    fixture = Fixture(user, questions, career_paths)
+    # Oldest first, so the latest attempt holds the iteration 0 answers
+    for iteration in reversed(range(submissions)):
+        AssessmentSubmission.objects.record(user, _answers(fixture, iteration))
+    # The scoring API reads its own answer rows and trains on their vectors
+    UserResponse.objects.bulk_create([
+        UserResponse(user=user, question=question, response_text=answer,
+                     response_vector=[[i % 7 for i in range(50)]])
+        for question, answer in _answers(fixture, 0)
+    ])
+    generate_recommendations(user)
+    # Large answer sets clamp the scores, which rules out incremental rescoring; detach the
+    # scores from their attempt so form submissions take the full rescore path at every volume
+    CareerRecommendation.objects.filter(user=user).update(submission=None)
+    return fixture
+
+
+def _send(client, budget, fixture, iteration):
+    extra = budget.request(fixture, iteration) if budget.request else {}
+    response = getattr(client, budget.method)(reverse(budget.url_name), **extra)
+    if response.streaming:
+        # Reading to the end closes the file
+        b''.join(response.streaming_content)
+    return response
+
+
+def _budget_test(budget):
+    def test(self):
+        with self.assertNumQueries(budget.queries):
+            response = _send(self.client, budget, self.fixture, 0)
+        self.assertEqual(response.status_code, budget.status)
+
+    test.__name__ = f'test_{budget.name}_query_budget'
+    test.__doc__ = f'{budget.name} runs {budget.queries} queries on a cold cache'
+    return test
+
+
+class ViewBudgetTests:
+    """Query budgets and opt-in latency baseline for one data volume; mixed into a TestCase"""
+
+    volume = None
+
+    @classmethod
+    def setUpClass(cls):
+        # Rendered reports go to a throwaway media directory. Enabled before the test data
+        # is seeded, and slow query capture is off so it writes nothing during requests
+        cls._media_root = tempfile.mkdtemp()
+        cls._overrides = override_settings(
+            CACHES=TEST_CACHES, MEDIA_ROOT=cls._media_root, SLOW_QUERY_CAPTURE=False, REPORT_RENDER_PROCESSES=0,
+        )
+        cls._overrides.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._overrides.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.fixture = seed_fixture(cls.volume)
+
+    def setUp(self):
+        # Every request starts cold: nothing cached by seeding or by an earlier test
+        caches['default'].clear()
+        clear_local_caches()
+        self.addCleanup(clear_local_caches)
+        self.client.force_login(self.fixture.user)
+
+    @skipUnless(os.getenv('PERF_BASELINE') or os.getenv('PERF_SAVE_BASELINE'),
+                'set PERF_BASELINE or PERF_SAVE_BASELINE to check view latencies')
+    def test_latency_baseline(self):
+        iterations = int(os.getenv('PERF_ITERATIONS', '5'))
+        results = {}
+        for budget in VIEW_BUDGETS:
+            # Each view starts from the seeded data, whatever the previous one wrote
+            with transaction.atomic():
+                _send(self.client, budget, self.fixture, 0)
+                timings = []
+                for iteration in range(1, iterations + 1):
+                    start = time.perf_counter()
+                    _send(self.client, budget, self.fixture, iteration)
+                    timings.append(time.perf_counter() - start)
+                transaction.set_rollback(True)
+            results[budget.name] = {'median_ms': round(statistics.median(timings) * 1000, 3)}
+
+        if os.getenv('PERF_SAVE_BASELINE'):
+            write_baseline(self.volume, results, os.getenv('PERF_SAVE_BASELINE'))
+        if os.getenv('PERF_BASELINE'):
+            baseline = load_baseline(os.getenv('PERF_BASELINE')).get(self.volume, {})
+            regressions = compare_to_baseline(results, baseline, float(os.getenv('PERF_TOLERANCE', '0.5')))
+            self.assertFalse(regressions, '\n'.join(regressions))
+
+
+for _budget in VIEW_BUDGETS:
+    setattr(ViewBudgetTests, f'test_{_budget.name}_query_budget', _budget_test(_budget))
+
+
+class SmallVolumeBudgetTests(ViewBudgetTests, TestCase):
+    volume = 'small'
+
+
+class LargeVolumeBudgetTests(ViewBudgetTests, TestCase):
+    volume = 'large'
+
+
+def write_baseline(volume, results, path):
+    """Save one volume's results into the latency baseline, keeping the other volumes"""
+    try:
+        baseline = load_baseline(path)
+    except (OSError, ValueError, KeyError):
+        baseline = {}
+    baseline[volume] = results
+    with open(path, 'w') as f:
+        json.dump({
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'database': connection.vendor,
+            'results': baseline,
+        }, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_to_baseline(results, baseline, tolerance=0.5):
+    """
+    Check median latencies against a baseline
+
+    Args:
+        results: View name -> metrics dict for one volume
+        baseline: The same volume's results from a baseline file
+        tolerance: Allowed fractional increase in median latency
+
+    Returns:
+        List of regression messages, empty when every view is within tolerance
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        limit = max(expected['median_ms'] * (1 + tolerance), expected['median_ms'] + MIN_REGRESSION_MS)
+        if metrics['median_ms'] > limit:
+            regressions.append(
+                f"{name}: median {metrics['median_ms']}ms exceeds baseline "
+                f"{expected['median_ms']}ms by more than {tolerance:.0%}"
+            )
+    return regressions
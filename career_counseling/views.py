@@ -4,6 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth.models import User
+from django.db.models import Prefetch, prefetch_related_objects
 from .models import (
     UserProfile,
     Question,
@@ -30,13 +31,12 @@ import nltk
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import json
-import matplotlib.pyplot as plt
-import seaborn as sns
-from io import BytesIO
-import base64
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from .ml.career_predictor import CareerPredictor
+from .metrics import observe_prediction
+from .recommendation_cache import bump_recommendation_version
+import time
 
 
 
@@ -117,7 +117,7 @@ class CareerRecommendationView(APIView):
                 X.extend(response.response_vector[0])
         
         # Get all career paths
-        career_paths = CareerPath.objects.all()
+        career_paths = list(CareerPath.objects.all())
         
         # Train decision tree (simplified for example)
         clf = DecisionTreeClassifier()
@@ -129,17 +129,21 @@ class CareerRecommendationView(APIView):
         # Make predictions
         predictions = clf.predict_proba(X)
         
-        # Create recommendations
-        recommendations = []
-        for i, career_path in enumerate(career_paths):
-            confidence = float(np.mean(predictions[:, i]) if i < predictions.shape[1] else 0)
-            recommendation = CareerRecommendation.objects.create(
+        # Create recommendations in one insert; bulk_create skips the post_save
+        # handlers, so the page cache and profile count are updated once below
+        recommendations = CareerRecommendation.objects.bulk_create([
+            CareerRecommendation(
                 user=user,
                 career_path=career_path,
-                confidence_score=confidence,
+                confidence_score=float(np.mean(predictions[:, i]) if i < predictions.shape[1] else 0),
                 reasoning="Based on your responses and our analysis"
             )
-            recommendations.append(recommendation)
+            for i, career_path in enumerate(career_paths)
+        ])
+        UserProfile.objects.filter(user=user).update(
+            recommendation_count=CareerRecommendation.objects.filter(user=user).count()
+        )
+        bump_recommendation_version(user.id)
         
         # Create assessment report
         report = self._generate_report(user, recommendations)
@@ -151,26 +155,11 @@ class CareerRecommendationView(APIView):
 
     def _generate_report(self, user, recommendations):
         # Analyze skills and interests
-        responses = UserResponse.objects.filter(user=user)
+        responses = UserResponse.objects.filter(user=user).select_related('question')
         skill_analysis = self._analyze_responses(responses, 'SKILLS')
         interest_analysis = self._analyze_responses(responses, 'INTERESTS')
         personality_insights = self._analyze_responses(responses, 'PERSONALITY')
         
-        # Create visualization
-        plt.figure(figsize=(10, 6))
-        careers = [r.career_path.title for r in recommendations[:5]]
-        scores = [r.confidence_score for r in recommendations[:5]]
-        sns.barplot(x=scores, y=careers)
-        plt.title('Top Career Recommendations')
-        
-        # Save plot to buffer
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        image_png = buffer.getvalue()
-        buffer.close()
-        graphic = base64.b64encode(image_png)
-        
         # Create report
         report = AssessmentReport.objects.create(
             user=user,
@@ -179,6 +168,11 @@ class CareerRecommendationView(APIView):
             personality_insights=personality_insights
         )
         report.recommendations.set(recommendations)
+        # The serializer nests each recommendation's career path
+        prefetch_related_objects(
+            [report],
+            Prefetch('recommendations', queryset=CareerRecommendation.objects.select_related('career_path'))
+        )
         
         return report
 
@@ -212,7 +206,9 @@ def assessment(request):
         predictor = CareerPredictor()
         
         # Get career recommendations
+        started = time.perf_counter()
         recommendations = predictor.get_career_recommendations(answers)
+        observe_prediction('get_career_recommendations', time.perf_counter() - started)
         primary_recommendation = recommendations[0]
         
         # Save the assessment result
@@ -243,7 +239,9 @@ def assessment_results(request):
     
     # Initialize the career predictor to get all probabilities
     predictor = CareerPredictor()
+    started = time.perf_counter()
     career_details = predictor.predict_career(result.answers)
+    observe_prediction('predict_career', time.perf_counter() - started)
     
     return render(request, 'career_counseling/assessment_results.html', {
         'result': result,
@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'counselbot.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is set up; serves recommendation Server-Sent Events
+from career_counseling.streaming import route_streams  # noqa: E402
+
+application = route_streams(django_application)
@@ -0,0 +1,144 @@
+"""
+Logging Pipeline
+Queue-backed handlers that move log I/O off the request thread, a sampled channel
+for per-row diagnostics and lazy %-style formatting helpers
+"""
+
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that writes records through other handlers on a background thread
+
+    The calling thread only filters and enqueues the record; message formatting and
+    stream/file I/O happen in a QueueListener started by the first record. Target handlers
+    are referenced by their settings.LOGGING names. dictConfig builds handlers in name
+    order, so a BackgroundHandler must be named to sort after its targets.
+    A full queue drops records instead of blocking a request.
+    """
+
+    def __init__(self, handlers=(), maxsize=10000):
+        """
+        Args:
+            handlers: Names of the LOGGING handlers that do the actual output
+            maxsize: Records buffered before new ones are dropped
+        """
+        super().__init__(queue.Queue(maxsize))
+        self.targets = [self._resolve(name) for name in handlers]
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _resolve(self, name):
+        if hasattr(logging, 'getHandlerByName'):
+            handler = logging.getHandlerByName(name)
+        else:
+            # Python < 3.12 keeps named handlers in a private registry
+            handler = logging._handlers.get(name)
+        if handler is None:
+            raise ValueError(f"Handler {name!r} is not configured yet; name this handler to sort after it")
+        return handler
+
+    def _ensure_listener(self):
+        if self._listener is not None and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._listener is not None and self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked child: the parent's listener thread did not come with us
+                self.queue = queue.Queue(self.maxsize)
+            self._listener = logging.handlers.QueueListener(self.queue, *self.targets, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+
+    def prepare(self, record):
+        # Records stay in-process, so leave formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def close(self):
+        # logging.shutdown() closes handlers at exit; stopping drains records still queued
+        with self._start_lock:
+            listener, self._listener = self._listener, None
+        if listener is not None and self._pid == os.getpid():
+            listener.stop()
+        super().close()
+
+
+class SampledFilter(logging.Filter):
+    """
+    Rate-limit records per call site with a token bucket
+
+    Each logging call site may emit `burst` records at once and `per_second` after that;
+    the rest are dropped. Passing records carry `suppressed`, the number dropped at
+    that call site since the previous one went through.
+    """
+
+    def __init__(self, per_second=5, burst=20):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        site = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, suppressed = self._buckets.get(site, (self.burst, now, 0))
+            tokens = min(self.burst, tokens + (now - updated) * self.per_second)
+            if tokens < 1:
+                self._buckets[site] = (tokens, now, suppressed + 1)
+                return False
+            self._buckets[site] = (tokens - 1, now, 0)
+        record.suppressed = suppressed
+        return True
+
+
+def diagnostics(name):
+    """
+    Logger for per-row diagnostics, sampled and off unless DIAGNOSTICS_LOG_LEVEL allows debug
+
+    Guard expensive arguments with lazy() rather than formatting them up front.
+    """
+    return logging.getLogger(f"diagnostics.{name}")
+
+
+class lazy:
+    """
+    Defer computing a log argument until a handler formats the record
+
+    Usage:
+        logger.debug("Scores: %s", lazy(format_scores, results))
+    """
+
+    __slots__ = ('func', 'args', 'kwargs')
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+    def __repr__(self):
+        return repr(self.func(*self.args, **self.kwargs))
@@ -14,6 +14,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from .database import database_from_url
+
 # Load environment variables
 load_dotenv()
 
@@ -49,12 +51,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'career_counseling.instrumentation.RequestTimingMiddleware',
+    'career_counseling.slow_queries.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'career_counseling.db_router.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'social_django.middleware.SocialAuthExceptionMiddleware',
@@ -86,13 +91,47 @@ WSGI_APPLICATION = 'counselbot.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# SQLite tuning applied on connection open: WAL, synchronous=NORMAL, mmap
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'True').lower() == 'true'
+SQLITE_BUSY_TIMEOUT_MS = 5000  # how long SQLite writers wait for the lock
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_url(
+        os.getenv('DATABASE_URL', 'sqlite:///db.sqlite3'),
+        BASE_DIR,
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '60')),  # persistent connections
+        conn_health_checks=True,
+        busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS,
+    )
 }
 
+# Optional read replica for catalog and history reads, e.g. postgres://...@standby:5432/counselbot
+# or sqlite:///db-replica.sqlite3 locally
+if os.getenv('DATABASE_REPLICA_URL'):
+    DATABASES['replica'] = database_from_url(
+        os.getenv('DATABASE_REPLICA_URL'),
+        BASE_DIR,
+        conn_max_age=int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        conn_health_checks=True,
+        busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['career_counseling.db_router.PrimaryReplicaRouter']
+
+# Models whose reads may be served by the replica
+REPLICA_READ_MODELS = [
+    'career_counseling.question',
+    'career_counseling.careerpath',
+    'career_counseling.careerrecommendation',
+    'career_counseling.assessmentreport',
+    'career_counseling.assessmentsubmission',
+    'career_counseling.questionset',
+    'career_counseling.userresponse',
+]
+REPLICA_PIN_SECONDS = 10  # reads stay on the primary this long after a user writes
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -134,6 +173,35 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
+# Uploaded and generated files (rendered PDF reports); not served publicly
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Shared cache tier: Redis when REDIS_URL is set (needs the redis package), otherwise
+# a file-based cache every process on the host can see
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', os.path.join(BASE_DIR, '.django_cache')),
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+# career_counseling.cache tiering
+CACHE_LOCAL_TIMEOUT = 60  # seconds a per-process entry is trusted before rechecking the shared tier
+CACHE_LOCK_TIMEOUT = 10  # seconds other processes wait on a key being computed
+CATALOG_CACHE_TIMEOUT = 60 * 60
+PAGE_FRAGMENT_CACHE_TIMEOUT = 24 * 60 * 60  # rendered per-user page fragments, keyed by data version
+PROFILE_HISTORY_LIMIT = 20  # most recent assessment attempts listed on the profile page
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -178,3 +246,80 @@ LOGOUT_REDIRECT_URL = 'login'
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
+
+# Recommendation job queue
+# Worker threads run inside each web process; set to 0 and use `manage.py run_workers` instead
+RECOMMENDATION_WORKER_THREADS = int(os.getenv('RECOMMENDATION_WORKER_THREADS', '2'))
+RECOMMENDATION_WORKER_POLL_SECONDS = 5
+RECOMMENDATION_STATUS_MAX_WAIT = 10  # seconds a status request may long-poll
+RECOMMENDATION_CLIENT_MAX_WAIT = 120  # seconds the assessment page waits for a job before giving up
+RECOMMENDATION_JOB_STALE_SECONDS = 300  # RUNNING jobs older than this were abandoned by a dead worker
+# Stream scores over Server-Sent Events when served through counselbot.asgi
+RECOMMENDATION_STREAMING = os.getenv('RECOMMENDATION_STREAMING', 'False').lower() == 'true'
+RECOMMENDATION_STREAM_GRACE_SECONDS = 5  # before workers take over an unclaimed streaming job
+
+# Recommendation result memoization
+RECOMMENDATION_CACHE_SIZE = 1024  # entries in the per-process LRU
+RECOMMENDATION_CACHE_ALIAS = os.getenv('RECOMMENDATION_CACHE_ALIAS', 'default') or None  # shared tier from CACHES; empty for process-local only
+RECOMMENDATION_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Background PDF pre-rendering (0 processes renders on first download instead)
+REPORT_RENDER_PROCESSES = int(os.getenv('REPORT_RENDER_PROCESSES', '1'))
+REPORT_RENDER_QUEUE_LIMIT = 32  # in-flight renders per web process
+REPORT_RENDER_WAIT_SECONDS = 30  # how long a download waits on an in-flight render
+REPORT_SPOOL_MAX_MEMORY = 1024 * 1024  # bytes of a render kept in memory before spilling to disk
+REPORT_HTML_CACHE_TIMEOUT = 24 * 60 * 60  # seconds a rendered HTML report body stays cached
+
+# Request instrumentation (career_counseling.instrumentation)
+REQUEST_TIME_BUDGET_MS = int(os.getenv('REQUEST_TIME_BUDGET_MS', '500'))
+REQUEST_QUERY_BUDGET = int(os.getenv('REQUEST_QUERY_BUDGET', '25'))
+# Per route name, e.g. {'download_report': {'ms': 3000}}
+REQUEST_BUDGET_OVERRIDES = {
+    'download_report': {'ms': 3000},
+    'assessment': {'ms': 1000},
+}
+REQUEST_TIMING_WINDOW = 500  # recent requests per route kept for percentiles
+SERVER_TIMING_HEADER = DEBUG
+
+# Slow query capture (career_counseling.slow_queries); view with the admin or `manage.py dump_slow_queries`
+SLOW_QUERY_CAPTURE = os.getenv('SLOW_QUERY_CAPTURE', 'True').lower() == 'true'
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_LIMIT = 500  # newest captured queries kept in the database
+SLOW_QUERY_BUFFER_SIZE = 20  # captured per request or job before older ones are dropped
+SLOW_QUERY_STACK_DEPTH = 6  # career_counseling frames kept per query
+
+# Prometheus metrics at /metrics (needs prometheus_client). Set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory before starting gunicorn so all workers' samples are aggregated
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+
+# Logging: request threads only enqueue records; a background listener formats and writes them
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Per-row diagnostics (counselbot.log.diagnostics) are skipped unless set to DEBUG, and then sampled per call site
+DIAGNOSTICS_LOG_LEVEL = os.getenv('DIAGNOSTICS_LOG_LEVEL', 'INFO')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'standard': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+        'diagnostics': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s (%(suppressed)d suppressed)'},
+    },
+    'filters': {
+        'sampled': {'()': 'counselbot.log.SampledFilter', 'per_second': 5, 'burst': 20},
+    },
+    # Queue handlers are named to sort after the handlers they write through
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'standard'},
+        'diagnostics_console': {'class': 'logging.StreamHandler', 'formatter': 'diagnostics'},
+        'queue': {'()': 'counselbot.log.BackgroundHandler', 'handlers': ['console']},
+        'queue_diagnostics': {
+            '()': 'counselbot.log.BackgroundHandler',
+            'handlers': ['diagnostics_console'],
+            'filters': ['sampled'],
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': LOG_LEVEL},
+    'loggers': {
+        'django': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        'diagnostics': {'handlers': ['queue_diagnostics'], 'level': DIAGNOSTICS_LOG_LEVEL, 'propagate': False},
+    },
+}
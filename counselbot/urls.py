@@ -24,11 +24,15 @@ urlpatterns = [
     path('', frontend_views.home, name='home'),
     path('profile/', frontend_views.profile, name='profile'),
     path('assessment/', frontend_views.assessment, name='assessment'),
+    path('assessment/status/<uuid:job_id>/', frontend_views.assessment_status, name='assessment_status'),
     path('recommendations/', frontend_views.recommendations, name='recommendations'),
     path('assessment/<int:assessment_id>/', frontend_views.assessment_detail, name='assessment_detail'),
     path('career/<int:career_id>/', frontend_views.career_detail, name='career_detail'),
     path('register/', frontend_views.register, name='register'),
+    path('report/', frontend_views.view_report, name='view_report'),
     path('download-report/', frontend_views.download_report, name='download_report'),
+    path('ops/timings/', frontend_views.request_timings, name='request_timings'),
+    path('metrics', frontend_views.prometheus_metrics, name='metrics'),
     path('', include('django.contrib.auth.urls')),
     path('social-auth/', include('social_django.urls', namespace='social')),
 ]
\ No newline at end of file